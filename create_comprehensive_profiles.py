@@ -47,12 +47,19 @@ def create_comprehensive_fighter_profiles():
         'Country', 'Place_of_Birth', 'Nickname', 'Stance'
     ]
     
-    # Create new comprehensive dataframe
-    comprehensive_df = pd.DataFrame(columns=comprehensive_columns)
+    # Fields that are the same for every fighter start out in one template that each row copies
+    fighter_template = dict.fromkeys(comprehensive_columns, '')
+    fighter_template.update({
+        'Draws': 0,  # Would need to calculate from fight history
+        'Takedowns_Attempted': 0,  # Would need to calculate from data
+        'Control_Time': 0,  # Would need to calculate from fight data
+        # Country, Place_of_Birth, Nickname and Stance stay '' (would need to extract from data)
+    })
     
     # Process each fighter
+    fighter_rows = []
     for idx, row in enhanced_df.iterrows():
-        fighter_data = {}
+        fighter_data = fighter_template.copy()
         
         # Basic Information
         fighter_data['Name'] = row.get('Name', '')
@@ -76,7 +83,6 @@ def create_comprehensive_fighter_profiles():
         fighter_data['Total_Fights'] = total_fights
         fighter_data['Wins'] = wins
         fighter_data['Losses'] = losses
-        fighter_data['Draws'] = 0  # Would need to calculate from fight history
         fighter_data['Win_Percentage'] = round((wins / total_fights * 100), 1) if total_fights > 0 else 0
         fighter_data['Title_Defenses'] = row.get('Title_Defenses', 0)
         fighter_data['Former_Champion'] = row.get('Former_Champion', 'No')
@@ -105,7 +111,6 @@ def create_comprehensive_fighter_profiles():
         
         # Grappling Statistics
         fighter_data['Takedowns_Landed'] = row.get('Takedownr', 0) or 0
-        fighter_data['Takedowns_Attempted'] = 0  # Would need to calculate from data
         fighter_data['Takedown_Accuracy'] = row.get('Takedown Accuracy', 0) or 0
         fighter_data['Takedown_Defense'] = row.get('Takedown_Defense', 0)
         fighter_data['Takedown_Avg_Per_15_Min'] = row.get('Takedown_Avg_Per_15_Min', 0)
@@ -116,7 +121,6 @@ def create_comprehensive_fighter_profiles():
         fighter_data['Knockdowns'] = row.get('Knockdow', 0) or 0
         fighter_data['Knockdown_Avg'] = row.get('Knockdown_Avg', 0)
         fighter_data['Average_Fight_Time'] = row.get('Average_Fight_Time', 0)
-        fighter_data['Control_Time'] = 0  # Would need to calculate from fight data
         
         # Recent Performance (Last 3 Fights)
         fighter_data['Event_1_Headline'] = row.get('Event_1_H', '')
@@ -137,14 +141,10 @@ def create_comprehensive_fighter_profiles():
         fighter_data['Event_3_Time'] = row.get('Event_3_Ti', '')
         fighter_data['Event_3_Method'] = row.get('Event_3_M', '')
         
-        # Additional Fields
-        fighter_data['Country'] = ''  # Would need to extract from data
-        fighter_data['Place_of_Birth'] = ''  # Would need to extract from data
-        fighter_data['Nickname'] = ''  # Would need to extract from data
-        fighter_data['Stance'] = ''  # Would need to extract from data
-        
-        # Add to comprehensive dataframe
-        comprehensive_df = pd.concat([comprehensive_df, pd.DataFrame([fighter_data])], ignore_index=True)
+        fighter_rows.append(fighter_data)
+    
+    # Build the comprehensive dataframe in one go rather than concatenating a frame per fighter
+    comprehensive_df = pd.DataFrame(fighter_rows, columns=comprehensive_columns, dtype=object)
     
     # Save comprehensive profiles
     comprehensive_df.to_csv('data/comprehensive_fighter_profiles.csv', index=False)
@@ -164,9 +164,10 @@ def create_comprehensive_fighter_profiles():
     # Show statistics
     print(f"\nComprehensive Profile Statistics:")
     print(f"Total Fighters: {len(comprehensive_df)}")
-    print(f"Fighters with Real Stats: {len(comprehensive_df[comprehensive_df['Sig_Strikes_Landed'] > 0])}")
-    print(f"Fighters with Takedowns: {len(comprehensive_df[comprehensive_df['Takedowns_Landed'] > 0])}")
-    print(f"Fighters with Submissions: {len(comprehensive_df[comprehensive_df['Submissions'] > 0])}")
+    # Count straight from the boolean masks rather than materializing a filtered copy of the frame each time
+    print(f"Fighters with Real Stats: {(comprehensive_df['Sig_Strikes_Landed'] > 0).sum()}")
+    print(f"Fighters with Takedowns: {(comprehensive_df['Takedowns_Landed'] > 0).sum()}")
+    print(f"Fighters with Submissions: {(comprehensive_df['Submissions'] > 0).sum()}")
     
     return comprehensive_df
 
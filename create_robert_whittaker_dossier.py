@@ -1,9 +1,5 @@
 import pandas as pd
 import numpy as np
-from pathlib import Path
-import re
-from datetime import datetime
-from bs4 import BeautifulSoup
 
 def extract_robert_whittaker_data():
     """Extract all available data for Robert Whittaker."""
@@ -87,29 +83,40 @@ def create_processed_ufc_fight_results_sheet(whittaker_striking):
     if whittaker_striking.empty:
         return pd.DataFrame()
     
-    fight_results = []
-    
-    for _, fight in whittaker_striking.iterrows():
-        fight_data = {
-            'EVENT': fight.get('Event', ''),
-            'BOUT': f"Whittaker vs {fight.get('Opponent', '')}",
-            'Weight Division': 'Middleweight',
-            'Fighter 1': 'Robert Whittaker',
-            'Fighter 2': fight.get('Opponent', ''),
-            'Winning Fighter': 'Robert Whittaker' if 'W' in str(fight.get('Result', '')).upper() else fight.get('Opponent', ''),
-            'Losing Fighter': fight.get('Opponent', '') if 'W' in str(fight.get('Result', '')).upper() else 'Robert Whittaker',
-            'METHOD': fight.get('Method', ''),
-            'ROUND': fight.get('Round', ''),
-            'TIME': fight.get('Time', ''),
-            'TIME FORMAT': '3-round' if '3' in str(fight.get('Round', '')) else '5-round',
-            'REFEREE': '',
-            'DETAILS': '',
-            'Date': fight.get('Date', ''),
-            'Fight Time (min)': 15  # Default estimate
-        }
-        fight_results.append(fight_data)
-    
-    return pd.DataFrame(fight_results)
+    # Build the sheet column-wise; the win mask is computed once for all fights
+    fights = whittaker_striking.reset_index(drop=True)
+    blank = pd.Series('', index=fights.index)
+    opponent = fights.get('Opponent', blank)
+    is_win = fights.get('Result', blank).astype(str).str.upper().str.contains('W', regex=False, na=False).to_numpy(dtype=bool)
+    fight_round = fights.get('Round', blank)
+    
+    return pd.DataFrame({
+        'EVENT': fights.get('Event', blank),
+        'BOUT': 'Whittaker vs ' + opponent.map(str),
+        'Weight Division': 'Middleweight',
+        'Fighter 1': 'Robert Whittaker',
+        'Fighter 2': opponent,
+        # Series.where keeps missing opponents missing (np.where would turn an all-NaN column into 'nan')
+        'Winning Fighter': opponent.where(~is_win, 'Robert Whittaker'),
+        'Losing Fighter': opponent.where(is_win, 'Robert Whittaker'),
+        'METHOD': fights.get('Method', blank),
+        'ROUND': fight_round,
+        'TIME': fights.get('Time', blank),
+        'TIME FORMAT': np.where(fight_round.astype(str).str.contains('3', regex=False, na=False), '3-round', '5-round'),
+        'REFEREE': '',
+        'DETAILS': '',
+        'Date': fights.get('Date', blank),
+        'Fight Time (min)': 15  # Default estimate
+    })
+
+def _first_fight_positions(fight_stats, dates, opponents):
+    """Row position of the first fight_stats row with each (Date, Opponent), or -1 if there is none."""
+    first_rows = {}
+    for position, key in enumerate(zip(fight_stats['Date'], fight_stats['Opponent'])):
+        # Missing dates/opponents never compared equal in the row-by-row lookup
+        if not (pd.isna(key[0]) or pd.isna(key[1])):
+            first_rows.setdefault(key, position)
+    return np.array([first_rows.get(key, -1) for key in zip(dates, opponents)], dtype=int)
 
 def create_fight_data_offensive_sheet(whittaker_striking, whittaker_clinch, whittaker_ground):
     """Create the offensive fight data sheet."""
@@ -117,49 +124,44 @@ def create_fight_data_offensive_sheet(whittaker_striking, whittaker_clinch, whit
     if whittaker_striking.empty:
         return pd.DataFrame()
     
-    offensive_data = []
-    
-    for _, fight in whittaker_striking.iterrows():
-        # Find corresponding clinch and ground data
-        fight_date = fight.get('Date', '')
-        fight_opponent = fight.get('Opponent', '')
-        
-        clinch_fight = whittaker_clinch[
-            (whittaker_clinch['Date'] == fight_date) & 
-            (whittaker_clinch['Opponent'] == fight_opponent)
-        ]
-        
-        ground_fight = whittaker_ground[
-            (whittaker_ground['Date'] == fight_date) & 
-            (whittaker_ground['Opponent'] == fight_opponent)
-        ]
-        
-        offensive_fight = {
-            'Player': 'Robert Whittaker',
-            'Date': fight_date,
-            'Opponent': fight_opponent,
-            'Event': fight.get('Event', ''),
-            'Result': fight.get('Result', ''),
-            'Stats Type': 'Striking',
-            'Fight Time (min)': 15,  # Default estimate
-            'Striking-TSL': fight.get('TSL', 0),
-            'Striking-TSA': fight.get('TSA', 0),
-            'Striking-SSL': fight.get('SSL', 0),
-            'Striking-SSA': fight.get('SSA', 0),
-            'Striking-KD': fight.get('KD', 0),
-            'Striking-%HEAD': fight.get('%HEAD', 0),
-            'Striking-%BODY': fight.get('%BODY', 0),
-            'Striking-%LEG': fight.get('%LEG', 0),
-            'Clinch-TDL': clinch_fight['TDL'].iloc[0] if not clinch_fight.empty else 0,
-            'Clinch-TDA': clinch_fight['TDA'].iloc[0] if not clinch_fight.empty else 0,
-            'Ground-SGBL': ground_fight['SGBL'].iloc[0] if not ground_fight.empty else 0,
-            'Ground-SGBA': ground_fight['SGBA'].iloc[0] if not ground_fight.empty else 0,
-            'Ground-ADHG': ground_fight['ADHG'].iloc[0] if not ground_fight.empty else 0
-        }
-        
-        offensive_data.append(offensive_fight)
-    
-    return pd.DataFrame(offensive_data)
+    fights = whittaker_striking.reset_index(drop=True)
+    blank = pd.Series('', index=fights.index)
+    zero = pd.Series(0, index=fights.index)
+    fight_date = fights.get('Date', blank)
+    fight_opponent = fights.get('Opponent', blank)
+    
+    # Find corresponding clinch and ground data with one keyed lookup per sheet instead of a scan per fight
+    clinch_positions = _first_fight_positions(whittaker_clinch, fight_date, fight_opponent)
+    ground_positions = _first_fight_positions(whittaker_ground, fight_date, fight_opponent)
+    
+    def matched(fight_stats, column, positions):
+        # Position -1 picks the appended 0 used for fights without a matching row; the dtype
+        # is inferred from the picked values only, as it was for the row-by-row records
+        values = np.append(fight_stats[column].to_numpy(dtype=object), 0)[positions]
+        return pd.Series(values).infer_objects()
+    
+    return pd.DataFrame({
+        'Player': 'Robert Whittaker',
+        'Date': fight_date,
+        'Opponent': fight_opponent,
+        'Event': fights.get('Event', blank),
+        'Result': fights.get('Result', blank),
+        'Stats Type': 'Striking',
+        'Fight Time (min)': 15,  # Default estimate
+        'Striking-TSL': fights.get('TSL', zero),
+        'Striking-TSA': fights.get('TSA', zero),
+        'Striking-SSL': fights.get('SSL', zero),
+        'Striking-SSA': fights.get('SSA', zero),
+        'Striking-KD': fights.get('KD', zero),
+        'Striking-%HEAD': fights.get('%HEAD', zero),
+        'Striking-%BODY': fights.get('%BODY', zero),
+        'Striking-%LEG': fights.get('%LEG', zero),
+        'Clinch-TDL': matched(whittaker_clinch, 'TDL', clinch_positions),
+        'Clinch-TDA': matched(whittaker_clinch, 'TDA', clinch_positions),
+        'Ground-SGBL': matched(whittaker_ground, 'SGBL', ground_positions),
+        'Ground-SGBA': matched(whittaker_ground, 'SGBA', ground_positions),
+        'Ground-ADHG': matched(whittaker_ground, 'ADHG', ground_positions)
+    })
 
 def create_fight_data_defensive_sheet(whittaker_striking, whittaker_clinch, whittaker_ground):
     """Create the defensive fight data sheet."""
@@ -167,46 +169,29 @@ def create_fight_data_defensive_sheet(whittaker_striking, whittaker_clinch, whit
     if whittaker_striking.empty:
         return pd.DataFrame()
     
-    defensive_data = []
-    
-    for _, fight in whittaker_striking.iterrows():
-        # Find corresponding clinch and ground data
-        fight_date = fight.get('Date', '')
-        fight_opponent = fight.get('Opponent', '')
-        
-        clinch_fight = whittaker_clinch[
-            (whittaker_clinch['Date'] == fight_date) & 
-            (whittaker_clinch['Opponent'] == fight_opponent)
-        ]
-        
-        ground_fight = whittaker_ground[
-            (whittaker_ground['Date'] == fight_date) & 
-            (whittaker_ground['Opponent'] == fight_opponent)
-        ]
-        
-        defensive_fight = {
-            'Player': 'Robert Whittaker',
-            'Date': fight_date,
-            'Opponent': fight_opponent,
-            'Event': fight.get('Event', ''),
-            'Result': fight.get('Result', ''),
-            'Stats Type': 'Defensive',
-            'Striking-SSL': 0,  # Would need opponent data
-            'Striking-SSA': 0,  # Would need opponent data
-            'Striking-KD': 0,   # Would need opponent data
-            'Striking-%HEAD': 0, # Would need opponent data
-            'Striking-%BODY': 0, # Would need opponent data
-            'Striking-%LEG': 0,  # Would need opponent data
-            'Clinch-TDL': 0,     # Would need opponent data
-            'Clinch-TDA': 0,     # Would need opponent data
-            'Ground-SGBL': 0,    # Would need opponent data
-            'Ground-SGBA': 0,    # Would need opponent data
-            'Ground-ADHG': 0     # Would need opponent data
-        }
-        
-        defensive_data.append(defensive_fight)
-    
-    return pd.DataFrame(defensive_data)
+    fights = whittaker_striking.reset_index(drop=True)
+    blank = pd.Series('', index=fights.index)
+    
+    # Opponent-side stats are not in the living documents yet, so every stat column is 0
+    return pd.DataFrame({
+        'Player': 'Robert Whittaker',
+        'Date': fights.get('Date', blank),
+        'Opponent': fights.get('Opponent', blank),
+        'Event': fights.get('Event', blank),
+        'Result': fights.get('Result', blank),
+        'Stats Type': 'Defensive',
+        'Striking-SSL': 0,  # Would need opponent data
+        'Striking-SSA': 0,  # Would need opponent data
+        'Striking-KD': 0,   # Would need opponent data
+        'Striking-%HEAD': 0, # Would need opponent data
+        'Striking-%BODY': 0, # Would need opponent data
+        'Striking-%LEG': 0,  # Would need opponent data
+        'Clinch-TDL': 0,     # Would need opponent data
+        'Clinch-TDA': 0,     # Would need opponent data
+        'Ground-SGBL': 0,    # Would need opponent data
+        'Ground-SGBA': 0,    # Would need opponent data
+        'Ground-ADHG': 0     # Would need opponent data
+    })
 
 def create_robert_whittaker_dossier():
     """Create a comprehensive Robert Whittaker dossier."""
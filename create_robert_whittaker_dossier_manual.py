@@ -1,9 +1,114 @@
+import functools
+import math
+import zipfile
+from xml.sax.saxutils import escape
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
-def create_robert_whittaker_dossier_manual():
-    """Create Robert Whittaker dossier using actual data found."""
+# Minimal XLSX package parts for the fixed four-sheet dossier layout
+CONTENT_TYPES_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '{overrides}'
+    '</Types>'
+)
+SHEET_OVERRIDE_TEMPLATE = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+WORKBOOK_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets>'
+    '</workbook>'
+)
+WORKBOOK_SHEET_TEMPLATE = '<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>'
+WORKBOOK_RELS_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{rels}'
+    '</Relationships>'
+)
+WORKBOOK_REL_TEMPLATE = (
+    '<Relationship Id="rId{n}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{n}.xml"/>'
+)
+SHEET_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>{rows}</sheetData>'
+    '</worksheet>'
+)
+ROW_TEMPLATE = '<row r="{r}">{cells}</row>'
+NUMBER_CELL_TEMPLATE = '<c r="{ref}"><v>{value}</v></c>'
+EMPTY_CELL_TEMPLATE = '<c r="{ref}"/>'
+STRING_CELL_TEMPLATE = '<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{value}</t></is></c>'
+
+def _column_letter(index):
+    """Convert a zero-based column index to an Excel column letter (0 -> A, 26 -> AA)."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _sheet_xml(df):
+    """Render a DataFrame (header row + values) as worksheet XML."""
+    columns = [_column_letter(i) for i in range(len(df.columns))]
+    
+    rows = []
+    for r, values in enumerate([list(df.columns)] + df.values.tolist(), start=1):
+        cells = []
+        for col, value in zip(columns, values):
+            ref = f"{col}{r}"
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                # Excel rejects nan/inf values as a corrupt file; leave those cells empty like to_excel does
+                if math.isfinite(value):
+                    cells.append(NUMBER_CELL_TEMPLATE.format(ref=ref, value=value))
+                else:
+                    cells.append(EMPTY_CELL_TEMPLATE.format(ref=ref))
+            else:
+                cells.append(STRING_CELL_TEMPLATE.format(ref=ref, value=escape(str(value))))
+        rows.append(ROW_TEMPLATE.format(r=r, cells=''.join(cells)))
+    
+    return SHEET_TEMPLATE.format(rows=''.join(rows))
+
+def _write_xlsx(filename, sheets):
+    """Write (sheet_name, DataFrame) pairs straight to an XLSX package without an Excel engine."""
+    numbers = range(1, len(sheets) + 1)
+    
+    with zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED) as xlsx:
+        xlsx.writestr('[Content_Types].xml', CONTENT_TYPES_TEMPLATE.format(
+            overrides=''.join(SHEET_OVERRIDE_TEMPLATE.format(n=n) for n in numbers)))
+        xlsx.writestr('_rels/.rels', ROOT_RELS)
+        xlsx.writestr('xl/workbook.xml', WORKBOOK_TEMPLATE.format(
+            sheets=''.join(WORKBOOK_SHEET_TEMPLATE.format(name=escape(name), n=n)
+                           for n, (name, _) in zip(numbers, sheets))))
+        xlsx.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS_TEMPLATE.format(
+            rels=''.join(WORKBOOK_REL_TEMPLATE.format(n=n) for n in numbers)))
+        for n, (_, df) in zip(numbers, sheets):
+            xlsx.writestr(f'xl/worksheets/sheet{n}.xml', _sheet_xml(df))
+
+def _build_dataframes():
+    """Return fresh copies of the four dossier sheets, so callers can modify them freely."""
+    return tuple(df.copy() for df in _static_dataframes())
+
+@functools.cache
+def _static_dataframes():
+    """Build the four dossier sheets from the static data (cached after the first call; do not modify)."""
     
     # Fighter Profile Sheet - Based on actual data found
     fighter_profile_data = {
@@ -285,12 +390,20 @@ def create_robert_whittaker_dossier_manual():
     
     defensive_df = pd.DataFrame(defensive_data)
     
+    return fighter_profile_df, fight_results_df, offensive_df, defensive_df
+
+def create_robert_whittaker_dossier_manual():
+    """Create Robert Whittaker dossier using actual data found."""
+    
+    fighter_profile_df, fight_results_df, offensive_df, defensive_df = _build_dataframes()
+    
     # Create Excel file with multiple sheets
-    with pd.ExcelWriter('Robert_Whittaker_Dossier.xlsx', engine='openpyxl') as writer:
-        fighter_profile_df.to_excel(writer, sheet_name='fighter_profiles', index=False)
-        fight_results_df.to_excel(writer, sheet_name='processed_ufc_fight_results', index=False)
-        offensive_df.to_excel(writer, sheet_name='fight_data_offensive_combined', index=False)
-        defensive_df.to_excel(writer, sheet_name='fight_data_defensive_combined', index=False)
+    _write_xlsx('Robert_Whittaker_Dossier.xlsx', [
+        ('fighter_profiles', fighter_profile_df),
+        ('processed_ufc_fight_results', fight_results_df),
+        ('fight_data_offensive_combined', offensive_df),
+        ('fight_data_defensive_combined', defensive_df),
+    ])
     
     print("🎯 Robert Whittaker Dossier Created Successfully!")
     
@@ -1,21 +1,141 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
 import re
-from datetime import datetime
-from bs4 import BeautifulSoup
+
+# Per-process dossier system, set once by the pool initializer
+_worker_system = None
+
+def _init_worker(system):
+    """Keep the already-loaded dossier system in the worker process."""
+    global _worker_system
+    _worker_system = system
+
+def _build_dossier(fighter_name, output_dir):
+    """Create one dossier inside a pool worker."""
+    try:
+        return _worker_system.create_fighter_dossier(fighter_name, output_dir)
+    except Exception as e:
+        print(f"❌ Error creating dossier for {fighter_name}: {e}")
+        return None
+
+# Header styling pandas applies with to_excel, reproduced for the streaming writer
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(*(Side(style='thin'),) * 4)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
+def _write_dossier_xlsx(filename, sheets):
+    """Stream (sheet_name, DataFrame) pairs to an XLSX file with a write-only openpyxl workbook."""
+    workbook = Workbook(write_only=True)
+    for sheet_name, df in sheets:
+        worksheet = workbook.create_sheet(sheet_name)
+        
+        header = []
+        for column in df.columns:
+            cell = WriteOnlyCell(worksheet, value=str(column))
+            cell.font, cell.border, cell.alignment = HEADER_FONT, HEADER_BORDER, HEADER_ALIGNMENT
+            header.append(cell)
+        worksheet.append(header)
+        
+        # Missing values become empty cells, as with to_excel
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            worksheet.append(row)
+    workbook.save(filename)
 
 class UniversalDossierSystem:
     """Universal system to create professional fighter dossiers from ESPN data."""
     
+    # Low-cardinality text columns of the living documents, stored as categoricals
+    CATEGORY_COLUMNS = ('Player', 'Opponent', 'Event', 'Method', 'Result')
+    
+    # Characters dropped from fighter names when building lookup keys
+    NON_KEY_CHARS = re.compile(r'[^a-z0-9]')
+    
     def __init__(self):
         """Initialize the dossier system with data sources."""
         self.profiles_df = None
         self.striking_df = None
         self.clinch_df = None
         self.ground_df = None
+        self._fighter_names = []
+        self._fighter_name_set = frozenset()
+        self._profiles_by_key = {}
+        self._striking_by_key = {}
+        self._clinch_by_key = {}
+        self._ground_by_key = {}
         self.load_data_sources()
     
+    @staticmethod
+    def _normalize_name(fighter_name):
+        """Normalize a fighter name into the lookup key used by the per-fighter indexes."""
+        return UniversalDossierSystem.NON_KEY_CHARS.sub('', fighter_name.lower())
+    
+    @staticmethod
+    def _index_by_key(df, name_column):
+        """Add a normalized '_key' column and group the frame by it once."""
+        df['_key'] = df[name_column].str.lower().str.replace(UniversalDossierSystem.NON_KEY_CHARS, '', regex=True)
+        return {key: group for key, group in df.groupby('_key', sort=False)}
+    
+    @staticmethod
+    def _first_fight_stats(fight_keys, fight_stats, columns):
+        """Columns of the first fight_stats row with each fight's (Date, Opponent), or 0 if there is none."""
+        # Missing dates/opponents never compared equal in the row-by-row lookup, so they match nothing
+        first_rows = fight_stats[['Date', 'Opponent']].reset_index(drop=True).dropna().drop_duplicates()
+        first_rows['_row'] = first_rows.index
+        positions = fight_keys.merge(first_rows, on=['Date', 'Opponent'], how='left')['_row']
+        positions = positions.fillna(-1).astype(int).to_numpy()
+        
+        stats = {}
+        for column in columns:
+            # Position -1 picks the appended 0; the dtype is inferred from the picked values only,
+            # as it was for the row-by-row records
+            values = np.append(fight_stats[column].to_numpy(dtype=object), 0)[positions]
+            stats[column] = pd.Series(values).infer_objects()
+        return stats
+    
+    @staticmethod
+    def _column(df, name, default=''):
+        """Return a column from the frame, or a constant default Series when it is missing."""
+        if name in df.columns:
+            return df[name]
+        return pd.Series(default, index=df.index)
+    
+    def _read_living_csv(self, path):
+        """Read a living document with its repeated text columns as category dtype."""
+        path = Path(path)
+        cache_path = path.with_suffix('.pkl')
+        
+        # Reuse the typed frame from the last run while the CSV is the same file (exact mtime and size),
+        # so a CSV restored with an older mtime still invalidates it
+        st = path.stat()
+        csv_stat = (st.st_mtime_ns, st.st_size)
+        if cache_path.exists():
+            try:
+                cached_stat, cached_df = pd.read_pickle(cache_path)
+                if cached_stat == csv_stat:
+                    return cached_df
+            except Exception as e:
+                # Unpickling a truncated cache or one from other pandas/numpy versions can raise almost anything
+                print(f"Ignoring unreadable cache {cache_path}: {e}")
+        
+        df = pd.read_csv(path, low_memory=False)
+        for column in self.CATEGORY_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+        
+        # The cache is only a speed-up, so a data folder that cannot be written still loads the CSV
+        try:
+            pd.to_pickle((csv_stat, df), cache_path)
+        except OSError as e:
+            print(f"Could not write cache {cache_path}: {e}")
+        return df
+    
     def load_data_sources(self):
         """Load all data sources for dossier creation."""
         print("Loading data sources...")
@@ -24,15 +144,21 @@ class UniversalDossierSystem:
         try:
             self.profiles_df = pd.read_csv('data/enhanced_fighter_profiles_final.csv')
             print(f"✓ Loaded {len(self.profiles_df)} fighter profiles")
-        except:
+        except (OSError, ValueError):  # missing, empty or malformed file (pandas parse errors are ValueErrors)
             self.profiles_df = pd.read_csv('data/fighter_profiles.csv')
             print(f"✓ Loaded {len(self.profiles_df)} fighter profiles (fallback)")
+        self._fighter_names = self.profiles_df['Name'].tolist()
+        self._fighter_name_set = frozenset(self._fighter_names)
+        self._profiles_by_key = self._index_by_key(self.profiles_df, 'Name')
         
         # Load living documents
         try:
-            self.striking_df = pd.read_csv('data/striking_data_living.csv', low_memory=False)
-            self.clinch_df = pd.read_csv('data/clinch_data_living.csv', low_memory=False)
-            self.ground_df = pd.read_csv('data/ground_data_living.csv', low_memory=False)
+            self.striking_df = self._read_living_csv('data/striking_data_living.csv')
+            self.clinch_df = self._read_living_csv('data/clinch_data_living.csv')
+            self.ground_df = self._read_living_csv('data/ground_data_living.csv')
+            self._striking_by_key = self._index_by_key(self.striking_df, 'Player')
+            self._clinch_by_key = self._index_by_key(self.clinch_df, 'Player')
+            self._ground_by_key = self._index_by_key(self.ground_df, 'Player')
             print(f"✓ Loaded living documents: {len(self.striking_df)} striking, {len(self.clinch_df)} clinch, {len(self.ground_df)} ground records")
         except Exception as e:
             print(f"Error loading living documents: {e}")
@@ -40,27 +166,19 @@ class UniversalDossierSystem:
     def get_fighter_data(self, fighter_name):
         """Extract all data for a specific fighter."""
         # Normalize fighter name for matching
-        normalized_name = fighter_name.replace(' ', '').replace('_', '').replace('-', '')
+        key = self._normalize_name(fighter_name)
         
         # Get fighter profile
-        fighter_profile = self.profiles_df[
-            self.profiles_df['Name'].str.contains(normalized_name, case=False, na=False)
-        ]
+        fighter_profile = self._profiles_by_key.get(key, self.profiles_df.iloc[:0])
         
         # Get fight data
-        fighter_striking = self.striking_df[
-            self.striking_df['Player'].str.contains(normalized_name, case=False, na=False)
-        ]
-        fighter_clinch = self.clinch_df[
-            self.clinch_df['Player'].str.contains(normalized_name, case=False, na=False)
-        ]
-        fighter_ground = self.ground_df[
-            self.ground_df['Player'].str.contains(normalized_name, case=False, na=False)
-        ]
+        fighter_striking = self._striking_by_key.get(key, self.striking_df.iloc[:0])
+        fighter_clinch = self._clinch_by_key.get(key, self.clinch_df.iloc[:0])
+        fighter_ground = self._ground_by_key.get(key, self.ground_df.iloc[:0])
         
         return fighter_profile, fighter_striking, fighter_clinch, fighter_ground
     
-    def create_fighter_profile_sheet(self, fighter_profile, fighter_name):
+    def create_fighter_profile_sheet(self, fighter_profile, fighter_striking, fighter_name):
         """Create the fighter profile sheet following professional dossier structure."""
         
         if fighter_profile.empty:
@@ -70,18 +188,16 @@ class UniversalDossierSystem:
         profile = fighter_profile.iloc[0]
         
         # Calculate derived statistics
-        total_fights = len(self.striking_df[self.striking_df['Player'].str.contains(fighter_name.replace(' ', ''), case=False, na=False)])
+        total_fights = len(fighter_striking)
         total_fight_time = total_fights * 15  # Estimate 15 minutes per fight
         
-        # Calculate win methods from fight data
-        fighter_fights = self.striking_df[self.striking_df['Player'].str.contains(fighter_name.replace(' ', ''), case=False, na=False)]
-        ko_tko_wins = len(fighter_fights[fighter_fights['Result'].str.contains('W', na=False) & 
-                                       (fighter_fights['Method'].str.contains('KO', na=False) | 
-                                        fighter_fights['Method'].str.contains('TKO', na=False))])
-        decision_wins = len(fighter_fights[fighter_fights['Result'].str.contains('W', na=False) & 
-                                         fighter_fights['Method'].str.contains('DEC', na=False)])
-        submission_wins = len(fighter_fights[fighter_fights['Result'].str.contains('W', na=False) & 
-                                           fighter_fights['Method'].str.contains('SUB', na=False)])
+        # Calculate win methods from fight data (win mask computed once, methods scanned on wins only)
+        is_win = fighter_striking['Result'].str.contains('W', na=False).to_numpy(dtype=bool)
+        win_methods = fighter_striking['Method'][is_win].astype(str).str.extract(r'(TKO|KO|SUB|DEC)', expand=False)
+        method_counts = win_methods.value_counts()
+        ko_tko_wins = int(method_counts.get('KO', 0) + method_counts.get('TKO', 0))
+        decision_wins = int(method_counts.get('DEC', 0))
+        submission_wins = int(method_counts.get('SUB', 0))
         
         # Create comprehensive fighter profile data
         fighter_profile_data = {
@@ -137,29 +253,28 @@ class UniversalDossierSystem:
         if fighter_striking.empty:
             return pd.DataFrame()
         
-        fight_results = []
-        
-        for _, fight in fighter_striking.iterrows():
-            fight_data = {
-                'EVENT': fight.get('Event', ''),
-                'BOUT': f"{fighter_name} vs {fight.get('Opponent', '')}",
-                'Weight Division': 'Unknown',
-                'Fighter 1': fighter_name,
-                'Fighter 2': fight.get('Opponent', ''),
-                'Winning Fighter': fighter_name if 'W' in str(fight.get('Result', '')).upper() else fight.get('Opponent', ''),
-                'Losing Fighter': fight.get('Opponent', '') if 'W' in str(fight.get('Result', '')).upper() else fighter_name,
-                'METHOD': fight.get('Method', ''),
-                'ROUND': fight.get('Round', ''),
-                'TIME': fight.get('Time', ''),
-                'TIME FORMAT': '3-round' if '3' in str(fight.get('Round', '')) else '5-round',
-                'REFEREE': '',
-                'DETAILS': '',
-                'Date': fight.get('Date', ''),
-                'Fight Time (min)': 15  # Default estimate
-            }
-            fight_results.append(fight_data)
-        
-        return pd.DataFrame(fight_results)
+        fights = fighter_striking.reset_index(drop=True)
+        opponent = self._column(fights, 'Opponent')
+        fight_round = self._column(fights, 'Round')
+        is_win = self._column(fights, 'Result').astype(str).str.upper().str.contains('W', regex=False, na=False).to_numpy(dtype=bool)
+        
+        return pd.DataFrame({
+            'EVENT': self._column(fights, 'Event'),
+            'BOUT': [f"{fighter_name} vs {name}" for name in opponent],
+            'Weight Division': 'Unknown',
+            'Fighter 1': fighter_name,
+            'Fighter 2': opponent,
+            'Winning Fighter': np.where(is_win, fighter_name, opponent),
+            'Losing Fighter': np.where(is_win, opponent, fighter_name),
+            'METHOD': self._column(fights, 'Method'),
+            'ROUND': fight_round,
+            'TIME': self._column(fights, 'Time'),
+            'TIME FORMAT': np.where(fight_round.fillna('').astype(str).str.contains('3', regex=False), '3-round', '5-round'),
+            'REFEREE': '',
+            'DETAILS': '',
+            'Date': self._column(fights, 'Date'),
+            'Fight Time (min)': 15  # Default estimate
+        })
     
     def create_offensive_sheet(self, fighter_striking, fighter_clinch, fighter_ground, fighter_name):
         """Create the offensive fight data sheet."""
@@ -167,49 +282,34 @@ class UniversalDossierSystem:
         if fighter_striking.empty:
             return pd.DataFrame()
         
-        offensive_data = []
-        
-        for _, fight in fighter_striking.iterrows():
-            # Find corresponding clinch and ground data
-            fight_date = fight.get('Date', '')
-            fight_opponent = fight.get('Opponent', '')
-            
-            clinch_fight = fighter_clinch[
-                (fighter_clinch['Date'] == fight_date) & 
-                (fighter_clinch['Opponent'] == fight_opponent)
-            ]
-            
-            ground_fight = fighter_ground[
-                (fighter_ground['Date'] == fight_date) & 
-                (fighter_ground['Opponent'] == fight_opponent)
-            ]
-            
-            offensive_fight = {
-                'Player': fighter_name,
-                'Date': fight_date,
-                'Opponent': fight_opponent,
-                'Event': fight.get('Event', ''),
-                'Result': fight.get('Result', ''),
-                'Stats Type': 'Striking',
-                'Fight Time (min)': 15,  # Default estimate
-                'Striking-TSL': fight.get('TSL', 0),
-                'Striking-TSA': fight.get('TSA', 0),
-                'Striking-SSL': fight.get('SSL', 0),
-                'Striking-SSA': fight.get('SSA', 0),
-                'Striking-KD': fight.get('KD', 0),
-                'Striking-%HEAD': fight.get('%HEAD', 0),
-                'Striking-%BODY': fight.get('%BODY', 0),
-                'Striking-%LEG': fight.get('%LEG', 0),
-                'Clinch-TDL': clinch_fight['TDL'].iloc[0] if not clinch_fight.empty else 0,
-                'Clinch-TDA': clinch_fight['TDA'].iloc[0] if not clinch_fight.empty else 0,
-                'Ground-SGBL': ground_fight['SGBL'].iloc[0] if not ground_fight.empty else 0,
-                'Ground-SGBA': ground_fight['SGBA'].iloc[0] if not ground_fight.empty else 0,
-                'Ground-ADHG': ground_fight['ADHG'].iloc[0] if not ground_fight.empty else 0
-            }
-            
-            offensive_data.append(offensive_fight)
-        
-        return pd.DataFrame(offensive_data)
+        # Join the matching clinch and ground rows for each fight in one pass
+        fights = fighter_striking.reset_index(drop=True)
+        fight_keys = fights[['Date', 'Opponent']]
+        clinch_stats = self._first_fight_stats(fight_keys, fighter_clinch, ['TDL', 'TDA'])
+        ground_stats = self._first_fight_stats(fight_keys, fighter_ground, ['SGBL', 'SGBA', 'ADHG'])
+        
+        return pd.DataFrame({
+            'Player': fighter_name,
+            'Date': fights['Date'],
+            'Opponent': fights['Opponent'],
+            'Event': self._column(fights, 'Event'),
+            'Result': self._column(fights, 'Result'),
+            'Stats Type': 'Striking',
+            'Fight Time (min)': 15,  # Default estimate
+            'Striking-TSL': self._column(fights, 'TSL', 0),
+            'Striking-TSA': self._column(fights, 'TSA', 0),
+            'Striking-SSL': self._column(fights, 'SSL', 0),
+            'Striking-SSA': self._column(fights, 'SSA', 0),
+            'Striking-KD': self._column(fights, 'KD', 0),
+            'Striking-%HEAD': self._column(fights, '%HEAD', 0),
+            'Striking-%BODY': self._column(fights, '%BODY', 0),
+            'Striking-%LEG': self._column(fights, '%LEG', 0),
+            'Clinch-TDL': clinch_stats['TDL'],
+            'Clinch-TDA': clinch_stats['TDA'],
+            'Ground-SGBL': ground_stats['SGBL'],
+            'Ground-SGBA': ground_stats['SGBA'],
+            'Ground-ADHG': ground_stats['ADHG']
+        })
     
     def create_defensive_sheet(self, fighter_striking, fighter_clinch, fighter_ground, fighter_name):
         """Create the defensive fight data sheet."""
@@ -217,46 +317,27 @@ class UniversalDossierSystem:
         if fighter_striking.empty:
             return pd.DataFrame()
         
-        defensive_data = []
-        
-        for _, fight in fighter_striking.iterrows():
-            # Find corresponding clinch and ground data
-            fight_date = fight.get('Date', '')
-            fight_opponent = fight.get('Opponent', '')
-            
-            clinch_fight = fighter_clinch[
-                (fighter_clinch['Date'] == fight_date) & 
-                (fighter_clinch['Opponent'] == fight_opponent)
-            ]
-            
-            ground_fight = fighter_ground[
-                (fighter_ground['Date'] == fight_date) & 
-                (fighter_ground['Opponent'] == fight_opponent)
-            ]
-            
-            defensive_fight = {
-                'Player': fighter_name,
-                'Date': fight_date,
-                'Opponent': fight_opponent,
-                'Event': fight.get('Event', ''),
-                'Result': fight.get('Result', ''),
-                'Stats Type': 'Defensive',
-                'Striking-SSL': 0,  # Would need opponent data
-                'Striking-SSA': 0,  # Would need opponent data
-                'Striking-KD': 0,   # Would need opponent data
-                'Striking-%HEAD': 0, # Would need opponent data
-                'Striking-%BODY': 0, # Would need opponent data
-                'Striking-%LEG': 0,  # Would need opponent data
-                'Clinch-TDL': 0,     # Would need opponent data
-                'Clinch-TDA': 0,     # Would need opponent data
-                'Ground-SGBL': 0,    # Would need opponent data
-                'Ground-SGBA': 0,    # Would need opponent data
-                'Ground-ADHG': 0     # Would need opponent data
-            }
-            
-            defensive_data.append(defensive_fight)
-        
-        return pd.DataFrame(defensive_data)
+        fights = fighter_striking.reset_index(drop=True)
+        
+        return pd.DataFrame({
+            'Player': fighter_name,
+            'Date': self._column(fights, 'Date'),
+            'Opponent': self._column(fights, 'Opponent'),
+            'Event': self._column(fights, 'Event'),
+            'Result': self._column(fights, 'Result'),
+            'Stats Type': 'Defensive',
+            'Striking-SSL': 0,  # Would need opponent data
+            'Striking-SSA': 0,  # Would need opponent data
+            'Striking-KD': 0,   # Would need opponent data
+            'Striking-%HEAD': 0, # Would need opponent data
+            'Striking-%BODY': 0, # Would need opponent data
+            'Striking-%LEG': 0,  # Would need opponent data
+            'Clinch-TDL': 0,     # Would need opponent data
+            'Clinch-TDA': 0,     # Would need opponent data
+            'Ground-SGBL': 0,    # Would need opponent data
+            'Ground-SGBA': 0,    # Would need opponent data
+            'Ground-ADHG': 0     # Would need opponent data
+        })
     
     def create_fighter_dossier(self, fighter_name, output_dir='dossiers'):
         """Create a comprehensive dossier for any fighter."""
@@ -275,7 +356,7 @@ class UniversalDossierSystem:
         
         # Create all sheets
         print("Creating fighter profile sheet...")
-        fighter_profile_sheet = self.create_fighter_profile_sheet(fighter_profile, fighter_name)
+        fighter_profile_sheet = self.create_fighter_profile_sheet(fighter_profile, fighter_striking, fighter_name)
         
         print("Creating fight results sheet...")
         fight_results_sheet = self.create_fight_results_sheet(fighter_striking, fighter_name)
@@ -290,11 +371,12 @@ class UniversalDossierSystem:
         safe_name = fighter_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
         filename = f"{output_dir}/{safe_name}_Dossier.xlsx"
         
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            fighter_profile_sheet.to_excel(writer, sheet_name='fighter_profiles', index=False)
-            fight_results_sheet.to_excel(writer, sheet_name='processed_ufc_fight_results', index=False)
-            offensive_sheet.to_excel(writer, sheet_name='fight_data_offensive_combined', index=False)
-            defensive_sheet.to_excel(writer, sheet_name='fight_data_defensive_combined', index=False)
+        _write_dossier_xlsx(filename, [
+            ('fighter_profiles', fighter_profile_sheet),
+            ('processed_ufc_fight_results', fight_results_sheet),
+            ('fight_data_offensive_combined', offensive_sheet),
+            ('fight_data_defensive_combined', defensive_sheet),
+        ])
         
         print(f"✅ Dossier created: {filename}")
         
@@ -313,26 +395,31 @@ class UniversalDossierSystem:
             'defensive_data': defensive_sheet
         }
     
-    def create_multiple_dossiers(self, fighter_names, output_dir='dossiers'):
-        """Create dossiers for multiple fighters."""
+    def create_multiple_dossiers(self, fighter_names, output_dir='dossiers', max_workers=None):
+        """Create dossiers for multiple fighters in parallel worker processes."""
         
         print(f"🎯 Creating dossiers for {len(fighter_names)} fighters...")
         
-        results = []
-        for fighter_name in fighter_names:
-            try:
-                result = self.create_fighter_dossier(fighter_name, output_dir)
-                if result:
-                    results.append(result)
-            except Exception as e:
-                print(f"❌ Error creating dossier for {fighter_name}: {e}")
+        Path(output_dir).mkdir(exist_ok=True)
+        max_workers = max_workers or min(len(fighter_names), os.cpu_count() or 1) or 1
+        
+        # Each worker receives the loaded frames once, then builds its dossiers independently
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(self,)) as executor:
+            results = [result for result in executor.map(_build_dossier, fighter_names, [output_dir] * len(fighter_names))
+                       if result]
         
         print(f"\n✅ Successfully created {len(results)} dossiers")
         return results
     
     def get_available_fighters(self):
         """Get list of all available fighters."""
-        return self.profiles_df['Name'].tolist()
+        # Hand out a copy so callers can sort or extend it without touching the loaded names
+        return list(self._fighter_names)
+    
+    def has_fighter(self, fighter_name):
+        """Check whether a profile exists for the fighter (exact name or normalized key)."""
+        return (fighter_name in self._fighter_name_set
+                or self._normalize_name(fighter_name) in self._profiles_by_key)
 
 def main():
     """Main function to demonstrate the universal dossier system."""
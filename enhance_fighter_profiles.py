@@ -18,71 +18,79 @@ def calculate_defensive_percentage(landed, absorbed):
         return round(((absorbed - landed) / absorbed) * 100, 1)
     return 0.0
 
-def extract_win_methods_from_living_docs():
-    """Extract win methods from living documents."""
+# Landed-strike columns of the striking living document, by target
+TARGET_COLUMNS = {'Head Strikes Landed': 'head', 'Body Strikes Landed': 'body', 'Leg Strikes Landed': 'leg'}
+
+# Numeric profile columns the enhancement reads; any the profiles CSV lacks count as 0
+PROFILE_STAT_COLUMNS = [
+    'Sig. Strike', 'Takedownr', 'Submissio', 'Knockdow', 'Fight',
+    'Striking ac', 'Takedown Accuracy', 'Win', 'Defeat',
+]
+
+def _count_text(counts):
+    """Render counts as text, with blank or zero counts shown as '0'."""
+    return counts.map(str).where(counts.notna() & counts.ne(0) & counts.ne(''), '0')
+
+def load_striking_data():
+    """Load the striking living document with only the columns used here."""
+    return pd.read_csv(
+        'data/striking_data_living.csv',
+        usecols=lambda column: column in ('Fighter', 'Result') or column in TARGET_COLUMNS,
+        dtype={'Fighter': 'category', 'Result': 'category'},
+    )
+
+def extract_win_methods_from_living_docs(striking_df=None):
+    """Extract win methods from living documents (loads the striking data unless given)."""
     try:
         # Load living documents
-        striking_df = pd.read_csv('data/striking_data_living.csv')
-        
-        # Group by fighter and count win methods
-        win_methods = {}
-        
-        for _, row in striking_df.iterrows():
-            fighter = row['Fighter']
-            result = row.get('Result', '')
-            
-            if fighter not in win_methods:
-                win_methods[fighter] = {'KO/TKO': 0, 'DEC': 0, 'SUB': 0, 'total_fights': 0}
-            
-            win_methods[fighter]['total_fights'] += 1
-            
-            if 'W' in str(result).upper():
-                if 'KO' in str(result).upper() or 'TKO' in str(result).upper():
-                    win_methods[fighter]['KO/TKO'] += 1
-                elif 'DEC' in str(result).upper() or 'DECISION' in str(result).upper():
-                    win_methods[fighter]['DEC'] += 1
-                elif 'SUB' in str(result).upper() or 'SUBMISSION' in str(result).upper():
-                    win_methods[fighter]['SUB'] += 1
+        if striking_df is None:
+            striking_df = load_striking_data()
+        
+        # Classify each distinct result once, then spread the methods to the rows via the category codes
+        results = striking_df.get('Result', pd.Series('', index=striking_df.index)).astype('category')
+        labels = pd.Series(results.cat.categories).astype(str).str.upper()
+        is_win = labels.str.contains('W', regex=False)
+        label_methods = np.select(
+            [
+                is_win & labels.str.contains('KO', regex=False),
+                is_win & labels.str.contains('DEC', regex=False),
+                is_win & labels.str.contains('SUB', regex=False),
+            ],
+            ['KO/TKO', 'DEC', 'SUB'],
+            default='',
+        )
+        method = np.append(label_methods, '')[results.cat.codes]  # code -1 (missing result) -> ''
+        
+        # Tally methods per fighter (in order of first appearance) alongside the fight count
+        fight_counts = striking_df.groupby('Fighter', sort=False, observed=True).size()
+        method_counts = pd.crosstab(striking_df['Fighter'], method).reindex(
+            index=fight_counts.index, columns=['KO/TKO', 'DEC', 'SUB'], fill_value=0
+        )
+        method_counts['total_fights'] = fight_counts
+        win_methods = method_counts.to_dict(orient='index')
         
         return win_methods
     except Exception as e:
         print(f"Error extracting win methods: {e}")
         return {}
 
-def calculate_target_breakdowns():
-    """Calculate target breakdowns from living documents."""
+def calculate_target_breakdowns(striking_df=None):
+    """Calculate target breakdowns from living documents (loads the striking data unless given)."""
     try:
-        striking_df = pd.read_csv('data/striking_data_living.csv')
+        if striking_df is None:
+            striking_df = load_striking_data()
         
-        target_breakdowns = {}
-        
-        for _, row in striking_df.iterrows():
-            fighter = row['Fighter']
-            
-            if fighter not in target_breakdowns:
-                target_breakdowns[fighter] = {'head': 0, 'body': 0, 'leg': 0, 'total': 0}
-            
-            # Extract target data if available
-            head_strikes = row.get('Head Strikes Landed', 0) or 0
-            body_strikes = row.get('Body Strikes Landed', 0) or 0
-            leg_strikes = row.get('Leg Strikes Landed', 0) or 0
-            
-            target_breakdowns[fighter]['head'] += head_strikes
-            target_breakdowns[fighter]['body'] += body_strikes
-            target_breakdowns[fighter]['leg'] += leg_strikes
-            target_breakdowns[fighter]['total'] += (head_strikes + body_strikes + leg_strikes)
+        # Sum landed strikes per target for every fighter in one groupby (missing counts are 0)
+        strikes = striking_df.reindex(columns=list(TARGET_COLUMNS), fill_value=0).fillna(0)
+        strikes['Fighter'] = striking_df['Fighter']
+        totals = strikes.groupby('Fighter', sort=False, observed=True).sum().rename(columns=TARGET_COLUMNS)
+        totals['total'] = totals[['head', 'body', 'leg']].sum(axis=1)
         
         # Calculate percentages
-        for fighter in target_breakdowns:
-            total = target_breakdowns[fighter]['total']
-            if total > 0:
-                target_breakdowns[fighter]['head_pct'] = round((target_breakdowns[fighter]['head'] / total) * 100, 1)
-                target_breakdowns[fighter]['body_pct'] = round((target_breakdowns[fighter]['body'] / total) * 100, 1)
-                target_breakdowns[fighter]['leg_pct'] = round((target_breakdowns[fighter]['leg'] / total) * 100, 1)
-            else:
-                target_breakdowns[fighter]['head_pct'] = 0
-                target_breakdowns[fighter]['body_pct'] = 0
-                target_breakdowns[fighter]['leg_pct'] = 0
+        has_strikes = totals['total'] > 0
+        for target in ('head', 'body', 'leg'):
+            totals[f'{target}_pct'] = (totals[target] / totals['total'] * 100).round(1).where(has_strikes, 0)
+        target_breakdowns = totals.to_dict(orient='index')
         
         return target_breakdowns
     except Exception as e:
@@ -98,7 +106,7 @@ def enhance_fighter_profiles():
     
     # Load living documents for additional data
     try:
-        striking_df = pd.read_csv('data/striking_data_living.csv')
+        striking_df = load_striking_data()
         clinch_df = pd.read_csv('data/clinch_data_living.csv')
         ground_df = pd.read_csv('data/ground_data_living.csv')
         print("Loaded living documents")
@@ -107,8 +115,8 @@ def enhance_fighter_profiles():
         return
     
     # Extract win methods and target breakdowns
-    win_methods = extract_win_methods_from_living_docs()
-    target_breakdowns = calculate_target_breakdowns()
+    win_methods = extract_win_methods_from_living_docs(striking_df)
+    target_breakdowns = calculate_target_breakdowns(striking_df)
     
     # Add new columns to profiles
     new_columns = [
@@ -123,69 +131,59 @@ def enhance_fighter_profiles():
         if col not in profiles_df.columns:
             profiles_df[col] = ''
     
-    # Process each fighter
-    for idx, row in profiles_df.iterrows():
-        fighter_name = row['Name']
-        
-        # Calculate rate statistics
-        total_sig_strikes = row.get('Sig. Strike', 0) or 0
-        total_takedowns = row.get('Takedownr', 0) or 0
-        total_submissions = row.get('Submissio', 0) or 0
-        total_knockdowns = row.get('Knockdow', 0) or 0
-        
-        # Estimate total fight time (average 3 rounds = 15 minutes per fight)
-        total_fights = row.get('Fight', 0) or 0
-        if total_fights > 0:
-            estimated_fight_time = total_fights * 15  # 15 minutes per fight average
-        else:
-            estimated_fight_time = 1  # Avoid division by zero
-        
-        # Calculate rates
-        sig_str_per_min, sig_str_per_15min = calculate_rate_stats(total_sig_strikes, estimated_fight_time)
-        takedown_per_min, takedown_per_15min = calculate_rate_stats(total_takedowns, estimated_fight_time)
-        submission_per_min, submission_per_15min = calculate_rate_stats(total_submissions, estimated_fight_time)
-        knockdown_per_min, knockdown_per_15min = calculate_rate_stats(total_knockdowns, estimated_fight_time)
-        
-        # Update profiles with calculated rates
-        profiles_df.at[idx, 'Sig_Str_Landed_Per_Min'] = sig_str_per_min
-        profiles_df.at[idx, 'Takedown_Avg_Per_15_Min'] = takedown_per_15min
-        profiles_df.at[idx, 'Submission_Avg_Per_15_Min'] = submission_per_15min
-        profiles_df.at[idx, 'Knockdown_Avg'] = knockdown_per_15min
-        profiles_df.at[idx, 'Average_Fight_Time'] = round(estimated_fight_time / total_fights if total_fights > 0 else 0, 1)
-        
-        # Add win methods
-        if fighter_name in win_methods:
-            methods = win_methods[fighter_name]
-            profiles_df.at[idx, 'Win_by_KO_TKO'] = methods['KO/TKO']
-            profiles_df.at[idx, 'Win_by_DEC'] = methods['DEC']
-            profiles_df.at[idx, 'Win_by_SUB'] = methods['SUB']
-        
-        # Add target breakdowns
-        if fighter_name in target_breakdowns:
-            breakdown = target_breakdowns[fighter_name]
-            profiles_df.at[idx, 'Sig_Str_Head_Pct'] = breakdown['head_pct']
-            profiles_df.at[idx, 'Sig_Str_Body_Pct'] = breakdown['body_pct']
-            profiles_df.at[idx, 'Sig_Str_Leg_Pct'] = breakdown['leg_pct']
-        
-        # Calculate defensive percentages (simplified - would need absorbed data)
-        sig_str_accuracy = row.get('Striking ac', 0) or 0
-        takedown_accuracy = row.get('Takedown Accuracy', 0) or 0
-        
-        profiles_df.at[idx, 'Sig_Str_Defense'] = round(100 - sig_str_accuracy, 1) if sig_str_accuracy > 0 else 0
-        profiles_df.at[idx, 'Takedown_Defense'] = round(100 - takedown_accuracy, 1) if takedown_accuracy > 0 else 0
-        
-        # Set division title based on division
-        division = row.get('Division Tr', '')
-        if division:
-            profiles_df.at[idx, 'Division_Title'] = f"{division} Division"
-        
-        # Set default values for missing fields
-        profiles_df.at[idx, 'Division_Record'] = f"{row.get('Win', 0) or 0}-{row.get('Defeat', 0) or 0}"
-        profiles_df.at[idx, 'Fight_Win_Streak'] = 0  # Would need fight history analysis
-        profiles_df.at[idx, 'Title_Defenses'] = 0
-        profiles_df.at[idx, 'Former_Champion'] = 'No'
-        profiles_df.at[idx, 'Octagon_Debut'] = ''  # Would need debut date
-        profiles_df.at[idx, 'Fighting_Style'] = 'Mixed Martial Arts'
+    # Calculate rate statistics for every fighter at once
+    profile_stats = profiles_df.reindex(columns=PROFILE_STAT_COLUMNS, fill_value=0)
+    total_sig_strikes = profile_stats['Sig. Strike']
+    total_takedowns = profile_stats['Takedownr']
+    total_submissions = profile_stats['Submissio']
+    total_knockdowns = profile_stats['Knockdow']
+    
+    # Estimate total fight time (average 3 rounds = 15 minutes per fight), 1 to avoid division by zero
+    total_fights = profile_stats['Fight']
+    has_fights = total_fights > 0
+    estimated_fight_time = (total_fights * 15).where(has_fights, 1)
+    
+    profiles_df['Sig_Str_Landed_Per_Min'] = (total_sig_strikes / estimated_fight_time).round(2)
+    profiles_df['Takedown_Avg_Per_15_Min'] = (total_takedowns / estimated_fight_time * 15).round(2)
+    profiles_df['Submission_Avg_Per_15_Min'] = (total_submissions / estimated_fight_time * 15).round(2)
+    profiles_df['Knockdown_Avg'] = (total_knockdowns / estimated_fight_time * 15).round(2)
+    profiles_df['Average_Fight_Time'] = (estimated_fight_time / total_fights).where(has_fights, 0).round(1)
+    
+    # Join win methods and target breakdowns onto the profiles by name in one merge
+    fighter_stats = pd.concat([
+        pd.DataFrame.from_dict(win_methods, orient='index', columns=['KO/TKO', 'DEC', 'SUB']),
+        pd.DataFrame.from_dict(target_breakdowns, orient='index', columns=['head_pct', 'body_pct', 'leg_pct']),
+    ], axis=1).rename(columns={
+        'KO/TKO': 'Win_by_KO_TKO', 'DEC': 'Win_by_DEC', 'SUB': 'Win_by_SUB',
+        'head_pct': 'Sig_Str_Head_Pct', 'body_pct': 'Sig_Str_Body_Pct', 'leg_pct': 'Sig_Str_Leg_Pct',
+    }).astype(object)
+    merged = profiles_df[['Name']].merge(fighter_stats, left_on='Name', right_index=True, how='left')
+    merged.index = profiles_df.index
+    
+    # Fighters missing from the living documents keep their current values
+    for column in fighter_stats.columns:
+        profiles_df[column] = merged[column].where(merged[column].notna(), profiles_df[column])
+    
+    # Calculate defensive percentages (simplified - would need absorbed data)
+    sig_str_accuracy = profile_stats['Striking ac']
+    takedown_accuracy = profile_stats['Takedown Accuracy']
+    profiles_df['Sig_Str_Defense'] = (100 - sig_str_accuracy).round(1).where(sig_str_accuracy > 0, 0)
+    profiles_df['Takedown_Defense'] = (100 - takedown_accuracy).round(1).where(takedown_accuracy > 0, 0)
+    
+    # Set division title based on division
+    division = profiles_df.get('Division Tr', pd.Series('', index=profiles_df.index))
+    has_division = division.notna() & division.ne('')
+    profiles_df['Division_Title'] = (division.map(str) + ' Division').where(has_division, profiles_df['Division_Title'])
+    
+    # Set default values for missing fields
+    profiles_df['Division_Record'] = (
+        _count_text(profile_stats['Win']) + '-' + _count_text(profile_stats['Defeat'])
+    )
+    profiles_df['Fight_Win_Streak'] = 0  # Would need fight history analysis
+    profiles_df['Title_Defenses'] = 0
+    profiles_df['Former_Champion'] = 'No'
+    profiles_df['Octagon_Debut'] = ''  # Would need debut date
+    profiles_df['Fighting_Style'] = 'Mixed Martial Arts'
     
     # Save enhanced profiles
     profiles_df.to_csv('data/enhanced_fighter_profiles.csv', index=False)
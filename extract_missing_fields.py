@@ -1,27 +1,51 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
-import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from bs4 import BeautifulSoup
 import json
 
+# Output field name -> lowercase page label text; each field is read from the value next to its label div
+PERSONAL_INFO_LABELS = {
+    'Nickname': 'nickname',
+    'Stance': 'stance',
+    'Birth_Date': 'birthdate',
+    'Team': 'team',
+}
+
+# Living-document columns each extractor reads; the rest of each CSV is skipped at parse time
+STRIKING_STAT_COLUMNS = {'Fighter', 'Result', 'Round', '%HEAD', '%BODY', '%LEG', 'SSL'}
+CLINCH_STAT_COLUMNS = {'Fighter', 'SCBL', 'SCHL', 'SCLL'}
+GROUND_STAT_COLUMNS = {'Fighter', 'SGBL', 'SGHL', 'SGLL', 'AD', 'RV', 'TDS'}
+FIGHT_HISTORY_COLUMNS = {'Fighter', 'Date', 'Opponent', 'Event', 'Result', 'Round', 'Time', 'Method'}
+
 def extract_personal_info_from_html(html_file_path: str) -> dict:
     """Extract personal information from HTML files."""
     try:
         with open(html_file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'lxml')
         personal_info = {}
         
+        # Find the first div for every label in one walk over the tree instead of one search per field
+        label_elems = {}
+        for div in soup.find_all('div', string=True):
+            div_text = div.string.lower()
+            for field, label in PERSONAL_INFO_LABELS.items():
+                if field not in label_elems and label in div_text:
+                    label_elems[field] = div
+            if len(label_elems) == len(PERSONAL_INFO_LABELS):
+                break
+        
         # Extract nickname
-        nickname_elem = soup.find('div', string=re.compile(r'Nickname', re.I))
+        nickname_elem = label_elems.get('Nickname')
         if nickname_elem and nickname_elem.find_next_sibling():
             personal_info['Nickname'] = nickname_elem.find_next_sibling().get_text(strip=True)
         
         # Extract stance
-        stance_elem = soup.find('div', string=re.compile(r'Stance', re.I))
+        stance_elem = label_elems.get('Stance')
         if stance_elem and stance_elem.find_next_sibling():
             personal_info['Stance'] = stance_elem.find_next_sibling().get_text(strip=True)
         
@@ -31,13 +55,13 @@ def extract_personal_info_from_html(html_file_path: str) -> dict:
             personal_info['Country'] = country_elem['alt']
         
         # Extract birth date
-        birth_elem = soup.find('div', string=re.compile(r'Birthdate', re.I))
+        birth_elem = label_elems.get('Birth_Date')
         if birth_elem and birth_elem.find_next_sibling():
             birth_text = birth_elem.find_next_sibling().get_text(strip=True)
             personal_info['Birth_Date'] = birth_text
         
         # Extract team
-        team_elem = soup.find('div', string=re.compile(r'Team', re.I))
+        team_elem = label_elems.get('Team')
         if team_elem and team_elem.find_next_sibling():
             personal_info['Team'] = team_elem.find_next_sibling().get_text(strip=True)
         
@@ -49,105 +73,98 @@ def extract_personal_info_from_html(html_file_path: str) -> dict:
 def extract_advanced_stats_from_living_docs():
     """Extract advanced statistics from living documents."""
     try:
+        living_docs = [Path('data/striking_data_living.csv'), Path('data/clinch_data_living.csv'),
+                       Path('data/ground_data_living.csv')]
+        cache_path = Path('data/advanced_stats_cache.pkl')
+        
+        # Reuse the aggregates from the last run while every living document is the same file
+        # (exact mtime and size), so a CSV restored with an older mtime still invalidates them
+        doc_stats = [(st.st_mtime_ns, st.st_size) for st in (doc.stat() for doc in living_docs)]
+        if cache_path.exists():
+            try:
+                cached_stats, cached_result = pd.read_pickle(cache_path)
+                if cached_stats == doc_stats:
+                    return cached_result
+            except Exception as e:
+                # Unpickling a truncated cache or one from other pandas/numpy versions can raise almost anything
+                print(f"Ignoring unreadable cache {cache_path}: {e}")
+        
         # Load living documents
-        striking_df = pd.read_csv('data/striking_data_living.csv', low_memory=False)
-        clinch_df = pd.read_csv('data/clinch_data_living.csv', low_memory=False)
-        ground_df = pd.read_csv('data/ground_data_living.csv', low_memory=False)
+        striking_df = pd.read_csv('data/striking_data_living.csv', low_memory=False,
+                                  usecols=lambda column: column in STRIKING_STAT_COLUMNS)
+        clinch_df = pd.read_csv('data/clinch_data_living.csv', low_memory=False,
+                                usecols=lambda column: column in CLINCH_STAT_COLUMNS)
+        ground_df = pd.read_csv('data/ground_data_living.csv', low_memory=False,
+                                usecols=lambda column: column in GROUND_STAT_COLUMNS)
+        
+        # Only rows with a fighter name count (missing names group together, as before)
+        if 'Fighter' not in striking_df.columns:
+            return {}
+        striking_df = striking_df[striking_df['Fighter'].ne('')]
+        blank = pd.Series('', index=striking_df.index)
+        
+        # Count wins/losses and win methods with string masks over the whole column
+        result = striking_df.get('Result', blank).map(str).str.upper()
+        is_win = result.str.contains('W', regex=False)
+        is_ko = is_win & result.str.contains('KO', regex=False)
+        is_sub = is_win & ~is_ko & result.str.contains('SUB', regex=False)
+        is_dec = is_win & ~is_ko & ~is_sub & result.str.contains('DEC', regex=False)
+        round_info = striking_df.get('Round', blank).map(str)
+        is_first_round = is_win & (round_info.str.contains('1', regex=False) | round_info.str.contains('First', regex=False))
+        
+        # Extract target breakdowns, truncating each fight's share to whole strikes
+        zero = pd.Series(0, index=striking_df.index)
+        total_strikes = striking_df.get('SSL', zero).fillna(0)
+        has_strikes = total_strikes > 0
+        
+        def target_strikes(column):
+            strikes = (striking_df.get(column, zero).fillna(0) / 100) * total_strikes
+            return strikes.where(has_strikes, 0).astype(np.int64)
         
-        advanced_stats = {}
+        per_fight = pd.DataFrame({
+            'total_fights': 1,
+            'wins': is_win,
+            'losses': ~is_win & result.str.contains('L', regex=False),
+            'first_round_wins': is_first_round,
+            'ko_tko_wins': is_ko,
+            'submission_wins': is_sub,
+            'decision_wins': is_dec,
+            'head_strikes': target_strikes('%HEAD'),
+            'body_strikes': target_strikes('%BODY'),
+            'leg_strikes': target_strikes('%LEG'),
+        }).astype(np.int64)
+        totals = per_fight.groupby(striking_df['Fighter'], sort=False, dropna=False).sum()
+        fighters = totals.index
         
-        # Process striking data for target breakdowns
-        for _, row in striking_df.iterrows():
-            fighter = row.get('Fighter', '')
-            if not fighter:
-                continue
-                
-            if fighter not in advanced_stats:
-                advanced_stats[fighter] = {
-                    'total_fights': 0,
-                    'wins': 0,
-                    'losses': 0,
-                    'first_round_wins': 0,
-                    'ko_tko_wins': 0,
-                    'submission_wins': 0,
-                    'decision_wins': 0,
-                    'total_control_time': 0,
-                    'total_advancements': 0,
-                    'total_reversals': 0,
-                    'total_slams': 0,
-                    'distance_strikes': 0,
-                    'clinch_strikes': 0,
-                    'ground_strikes': 0,
-                    'head_strikes': 0,
-                    'body_strikes': 0,
-                    'leg_strikes': 0
-                }
-            
-            advanced_stats[fighter]['total_fights'] += 1
-            
-            # Count wins/losses
-            result = str(row.get('Result', '')).upper()
-            if 'W' in result:
-                advanced_stats[fighter]['wins'] += 1
-                
-                # Count win methods
-                if 'KO' in result or 'TKO' in result:
-                    advanced_stats[fighter]['ko_tko_wins'] += 1
-                elif 'SUB' in result:
-                    advanced_stats[fighter]['submission_wins'] += 1
-                elif 'DEC' in result:
-                    advanced_stats[fighter]['decision_wins'] += 1
-                
-                # Count first round wins
-                round_info = str(row.get('Round', ''))
-                if '1' in round_info or 'First' in round_info:
-                    advanced_stats[fighter]['first_round_wins'] += 1
-            elif 'L' in result:
-                advanced_stats[fighter]['losses'] += 1
-            
-            # Extract target breakdowns
-            head_pct = row.get('%HEAD', 0) or 0
-            body_pct = row.get('%BODY', 0) or 0
-            leg_pct = row.get('%LEG', 0) or 0
-            
-            total_strikes = row.get('SSL', 0) or 0
-            
-            if total_strikes > 0:
-                advanced_stats[fighter]['head_strikes'] += int((head_pct / 100) * total_strikes)
-                advanced_stats[fighter]['body_strikes'] += int((body_pct / 100) * total_strikes)
-                advanced_stats[fighter]['leg_strikes'] += int((leg_pct / 100) * total_strikes)
+        def fighter_totals(df, columns):
+            # Sum the given columns per fighter; fighters without rows keep an integer 0
+            if 'Fighter' not in df.columns:
+                return pd.Series(0, index=fighters, dtype=object)
+            values = sum(df.get(column, pd.Series(0, index=df.index)).fillna(0) for column in columns)
+            summed = values.groupby(df['Fighter'], dropna=False).sum()
+            return summed.astype(object).reindex(fighters, fill_value=0)
         
-        # Process clinch data
-        for _, row in clinch_df.iterrows():
-            fighter = row.get('Fighter', '')
-            if fighter in advanced_stats:
-                # Count clinch strikes
-                clinch_strikes = row.get('SCBL', 0) or 0
-                clinch_strikes += row.get('SCHL', 0) or 0
-                clinch_strikes += row.get('SCLL', 0) or 0
-                advanced_stats[fighter]['clinch_strikes'] += clinch_strikes
+        # Process clinch and ground data for the fighters seen in the striking data
+        totals['total_control_time'] = 0
+        totals['total_advancements'] = fighter_totals(ground_df, ['AD'])
+        totals['total_reversals'] = fighter_totals(ground_df, ['RV'])
+        totals['total_slams'] = fighter_totals(ground_df, ['TDS'])
+        totals['distance_strikes'] = 0
+        totals['clinch_strikes'] = fighter_totals(clinch_df, ['SCBL', 'SCHL', 'SCLL'])
+        totals['ground_strikes'] = fighter_totals(ground_df, ['SGBL', 'SGHL', 'SGLL'])
         
-        # Process ground data
-        for _, row in ground_df.iterrows():
-            fighter = row.get('Fighter', '')
-            if fighter in advanced_stats:
-                # Count ground strikes
-                ground_strikes = row.get('SGBL', 0) or 0
-                ground_strikes += row.get('SGHL', 0) or 0
-                ground_strikes += row.get('SGLL', 0) or 0
-                advanced_stats[fighter]['ground_strikes'] += ground_strikes
-                
-                # Count advancements
-                advancements = row.get('AD', 0) or 0
-                advanced_stats[fighter]['total_advancements'] += advancements
-                
-                # Count reversals
-                reversals = row.get('RV', 0) or 0
-                advanced_stats[fighter]['total_reversals'] += reversals
-                
-                # Count slams
-                slams = row.get('TDS', 0) or 0
-                advanced_stats[fighter]['total_slams'] += slams
+        advanced_stats = totals[[
+            'total_fights', 'wins', 'losses', 'first_round_wins', 'ko_tko_wins',
+            'submission_wins', 'decision_wins', 'total_control_time', 'total_advancements',
+            'total_reversals', 'total_slams', 'distance_strikes', 'clinch_strikes',
+            'ground_strikes', 'head_strikes', 'body_strikes', 'leg_strikes',
+        ]].to_dict(orient='index')
+        
+        # The cache is only a speed-up, so a data folder that cannot be written still returns the result
+        try:
+            pd.to_pickle((doc_stats, advanced_stats), cache_path)
+        except OSError as e:
+            print(f"Could not write cache {cache_path}: {e}")
         
         return advanced_stats
     except Exception as e:
@@ -157,49 +174,33 @@ def extract_advanced_stats_from_living_docs():
 def extract_fight_history_details():
     """Extract detailed fight history information."""
     try:
-        striking_df = pd.read_csv('data/striking_data_living.csv', low_memory=False)
+        striking_df = pd.read_csv('data/striking_data_living.csv', low_memory=False,
+                                  usecols=lambda column: column in FIGHT_HISTORY_COLUMNS)
+        
+        # Only rows with a fighter name count, in order of each fighter's first fight
+        if 'Fighter' not in striking_df.columns:
+            return {}
+        striking_df = striking_df[striking_df['Fighter'].ne('')]
+        fighters = pd.Index(striking_df['Fighter'].unique())
+        blank = pd.Series('', index=striking_df.index)
         
-        fight_history = {}
+        # Extract fight details: gather each field's non-blank values per fighter with one groupby
+        history_columns = {
+            'fight_dates': 'Date', 'opponents': 'Opponent', 'events': 'Event', 'results': 'Result',
+            'rounds': 'Round', 'times': 'Time', 'methods': 'Method',
+        }
+        field_lists = {}
+        for field, column in history_columns.items():
+            values = striking_df.get(column, blank)
+            values = values[values.astype(bool)]
+            grouped = values.groupby(striking_df['Fighter'], sort=False, dropna=False).agg(list)
+            field_lists[field] = grouped.reindex(fighters).tolist()
         
-        for _, row in striking_df.iterrows():
-            fighter = row.get('Fighter', '')
-            if not fighter:
-                continue
-                
-            if fighter not in fight_history:
-                fight_history[fighter] = {
-                    'fight_dates': [],
-                    'opponents': [],
-                    'events': [],
-                    'results': [],
-                    'rounds': [],
-                    'times': [],
-                    'methods': []
-                }
-            
-            # Extract fight details
-            date = row.get('Date', '')
-            opponent = row.get('Opponent', '')
-            event = row.get('Event', '')
-            result = row.get('Result', '')
-            round_info = row.get('Round', '')
-            time = row.get('Time', '')
-            method = row.get('Method', '')
-            
-            if date:
-                fight_history[fighter]['fight_dates'].append(date)
-            if opponent:
-                fight_history[fighter]['opponents'].append(opponent)
-            if event:
-                fight_history[fighter]['events'].append(event)
-            if result:
-                fight_history[fighter]['results'].append(result)
-            if round_info:
-                fight_history[fighter]['rounds'].append(round_info)
-            if time:
-                fight_history[fighter]['times'].append(time)
-            if method:
-                fight_history[fighter]['methods'].append(method)
+        fight_history = {
+            fighter: {field: lists[position] if isinstance(lists[position], list) else []
+                      for field, lists in field_lists.items()}
+            for position, fighter in enumerate(fighters)
+        }
         
         return fight_history
     except Exception as e:
@@ -219,9 +220,14 @@ def enhance_fighter_profiles_with_missing_fields():
     html_dir = Path('data/FighterHTMLs')
     html_files = list(html_dir.glob('*.html'))
     
-    for html_file in html_files[:100]:  # Process first 100 for testing
-        fighter_name = html_file.stem.replace('_', '')
-        personal_info[fighter_name] = extract_personal_info_from_html(str(html_file))
+    html_files = html_files[:100]  # Process first 100 for testing
+    
+    # Each page is parsed independently, so spread the parsing across processes
+    with ProcessPoolExecutor() as executor:
+        extracted = executor.map(extract_personal_info_from_html, map(str, html_files), chunksize=8)
+        for html_file, info in zip(html_files, extracted):
+            fighter_name = html_file.stem.replace('_', '')
+            personal_info[fighter_name] = info
     
     print("Extracting advanced statistics from living documents...")
     advanced_stats = extract_advanced_stats_from_living_docs()
@@ -244,46 +250,30 @@ def enhance_fighter_profiles_with_missing_fields():
         if col not in profiles_df.columns:
             profiles_df[col] = ''
     
-    # Update profiles with extracted data
-    updated_count = 0
-    for idx, row in profiles_df.iterrows():
-        fighter_name = row['Name']
-        
-        # Add personal information
-        if fighter_name in personal_info:
-            info = personal_info[fighter_name]
-            for key, value in info.items():
-                if key in profiles_df.columns:
-                    profiles_df.at[idx, key] = value
-        
-        # Add advanced statistics
-        if fighter_name in advanced_stats:
-            stats = advanced_stats[fighter_name]
-            profiles_df.at[idx, 'First_Round_Wins'] = stats.get('first_round_wins', 0)
-            profiles_df.at[idx, 'KO_TKO_Wins'] = stats.get('ko_tko_wins', 0)
-            profiles_df.at[idx, 'Submission_Wins'] = stats.get('submission_wins', 0)
-            profiles_df.at[idx, 'Decision_Wins'] = stats.get('decision_wins', 0)
-            profiles_df.at[idx, 'Total_Control_Time'] = stats.get('total_control_time', 0)
-            profiles_df.at[idx, 'Total_Advancements'] = stats.get('total_advancements', 0)
-            profiles_df.at[idx, 'Total_Reversals'] = stats.get('total_reversals', 0)
-            profiles_df.at[idx, 'Total_Slams'] = stats.get('total_slams', 0)
-            profiles_df.at[idx, 'Distance_Strikes'] = stats.get('distance_strikes', 0)
-            profiles_df.at[idx, 'Clinch_Strikes'] = stats.get('clinch_strikes', 0)
-            profiles_df.at[idx, 'Ground_Strikes'] = stats.get('ground_strikes', 0)
-            profiles_df.at[idx, 'Head_Strikes'] = stats.get('head_strikes', 0)
-            profiles_df.at[idx, 'Body_Strikes'] = stats.get('body_strikes', 0)
-            profiles_df.at[idx, 'Leg_Strikes'] = stats.get('leg_strikes', 0)
-        
-        # Add fight history details
-        if fighter_name in fight_history:
-            history = fight_history[fighter_name]
-            if history['fight_dates']:
-                # Find UFC debut (first fight)
-                profiles_df.at[idx, 'UFC_Debut_Date'] = history['fight_dates'][-1] if history['fight_dates'] else ''
-        
-        updated_count += 1
-        if updated_count % 100 == 0:
-            print(f"Updated {updated_count} fighters...")
+    # Collect the extracted data per fighter name, using the profile column names
+    stat_columns = {
+        'first_round_wins': 'First_Round_Wins', 'ko_tko_wins': 'KO_TKO_Wins',
+        'submission_wins': 'Submission_Wins', 'decision_wins': 'Decision_Wins',
+        'total_control_time': 'Total_Control_Time', 'total_advancements': 'Total_Advancements',
+        'total_reversals': 'Total_Reversals', 'total_slams': 'Total_Slams',
+        'distance_strikes': 'Distance_Strikes', 'clinch_strikes': 'Clinch_Strikes',
+        'ground_strikes': 'Ground_Strikes', 'head_strikes': 'Head_Strikes',
+        'body_strikes': 'Body_Strikes', 'leg_strikes': 'Leg_Strikes',
+    }
+    # Find UFC debut (first fight)
+    debut_dates = {name: history['fight_dates'][-1] for name, history in fight_history.items() if history['fight_dates']}
+    extracted = pd.concat([
+        pd.DataFrame.from_dict(personal_info, orient='index'),
+        pd.DataFrame.from_dict(advanced_stats, orient='index', columns=list(stat_columns)).rename(columns=stat_columns),
+        pd.Series(debut_dates, name='UFC_Debut_Date', dtype=object),
+    ], axis=1).astype(object)
+    extracted = extracted.loc[extracted.index.notna(), extracted.columns.isin(profiles_df.columns)]
+    
+    # Update profiles with extracted data in one merge by name; fighters without data keep their values
+    merged = profiles_df[['Name']].merge(extracted, left_on='Name', right_index=True, how='left')
+    merged.index = profiles_df.index
+    for column in extracted.columns:
+        profiles_df[column] = merged[column].where(merged[column].notna(), profiles_df[column])
     
     # Save enhanced profiles
     profiles_df.to_csv('data/enhanced_fighter_profiles_final.csv', index=False)
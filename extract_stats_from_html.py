@@ -5,15 +5,32 @@ import os
 from pathlib import Path
 from bs4 import BeautifulSoup
 import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional
 
+def _parse_stat_cells(cells, *indexes) -> Optional[List[int]]:
+    """Read integer stat cells ('-' or blank count as 0); None if a cell is missing or not a number."""
+    if len(cells) <= max(indexes):
+        return None
+    values = []
+    for index in indexes:
+        text = cells[index].get_text(strip=True)
+        if text == '-' or text == '':
+            values.append(0)
+        elif text.isdigit():
+            values.append(int(text))
+        else:
+            return None
+    return values
+
 def extract_fighter_stats_from_html(html_file_path: str) -> Dict:
     """Extract detailed fighter statistics from ESPN HTML file."""
     try:
         with open(html_file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'lxml')
         
         # Initialize stats dictionary
         stats = {}
@@ -42,50 +59,32 @@ def extract_fighter_stats_from_html(html_file_path: str) -> Dict:
             # Check if this is a stats table by looking at headers
             headers = [th.get_text(strip=True) for th in rows[0].find_all('th')]
             
-            # Process striking data
+            # Process striking data (SSL/SSA columns)
             if 'SSL' in headers or 'Significant Strikes Landed' in str(headers):
                 for row in rows[1:]:  # Skip header row
-                    cells = row.find_all('td')
-                    if len(cells) >= 8:
-                        try:
-                            ssl = cells[7].get_text(strip=True)  # SSL column
-                            ssa = cells[8].get_text(strip=True)  # SSA column
-                            
-                            if ssl != '-' and ssl != '':
-                                total_sig_strikes_landed += int(ssl)
-                            if ssa != '-' and ssa != '':
-                                total_sig_strikes_attempted += int(ssa)
-                            fight_count += 1
-                        except (ValueError, IndexError):
-                            continue
+                    values = _parse_stat_cells(row.find_all('td'), 7, 8)
+                    if values is None:
+                        continue
+                    total_sig_strikes_landed += values[0]
+                    total_sig_strikes_attempted += values[1]
+                    fight_count += 1
             
-            # Process clinch data for takedowns
+            # Process clinch data for takedowns (TDL/TDA columns)
             if 'TDL' in headers or 'Takedowns Landed' in str(headers):
                 for row in rows[1:]:
-                    cells = row.find_all('td')
-                    if len(cells) >= 13:
-                        try:
-                            tdl = cells[12].get_text(strip=True)  # TDL column
-                            tda = cells[13].get_text(strip=True)  # TDA column
-                            
-                            if tdl != '-' and tdl != '':
-                                total_takedowns_landed += int(tdl)
-                            if tda != '-' and tda != '':
-                                total_takedowns_attempted += int(tda)
-                        except (ValueError, IndexError):
-                            continue
+                    values = _parse_stat_cells(row.find_all('td'), 12, 13)
+                    if values is None:
+                        continue
+                    total_takedowns_landed += values[0]
+                    total_takedowns_attempted += values[1]
             
-            # Process striking data for knockdowns
+            # Process striking data for knockdowns (KD column)
             if 'KD' in headers or 'Knockdowns' in str(headers):
                 for row in rows[1:]:
-                    cells = row.find_all('td')
-                    if len(cells) >= 13:
-                        try:
-                            kd = cells[12].get_text(strip=True)  # KD column
-                            if kd != '-' and kd != '':
-                                total_knockdowns += int(kd)
-                        except (ValueError, IndexError):
-                            continue
+                    values = _parse_stat_cells(row.find_all('td'), 12)
+                    if values is None:
+                        continue
+                    total_knockdowns += values[0]
         
         # Calculate averages and percentages
         if fight_count > 0:
@@ -132,37 +131,56 @@ def process_html_files_to_profiles():
     
     print(f"Found {len(html_files)} HTML files to process")
     
+    # Parse every file up front across worker processes; matching stays sequential below because
+    # each update can rewrite the Name column that later files are matched against
+    with ProcessPoolExecutor() as executor:
+        all_stats = list(executor.map(extract_fighter_stats_from_html, map(str, html_files), chunksize=32))
+    
+    # Index rows by lowercased name once so exact matches are dict lookups instead of column scans
+    rows_by_name = defaultdict(list)
+    for idx, name in profiles_df['Name'].items():
+        if isinstance(name, str):
+            rows_by_name[name.lower()].append(idx)
+    
     # Track updates
     updated_count = 0
     
-    for html_file in html_files:
+    for html_file, stats in zip(html_files, all_stats):
         html_name = html_file.stem  # e.g., "Aalon_Cruz"
         
         # Convert HTML name to CSV format (remove underscores and spaces)
         csv_name = html_name.replace('_', '').replace('-', '').replace('.', '')
         
         # Find matching fighter in profiles
-        mask = profiles_df['Name'].str.lower() == csv_name.lower()
-        if not mask.any():
+        rows = rows_by_name.get(csv_name.lower())
+        if not rows:
             # Try with underscores as spaces
             space_name = html_name.replace('_', ' ')
-            mask = profiles_df['Name'].str.lower() == space_name.lower()
-            if not mask.any():
+            rows = rows_by_name.get(space_name.lower())
+            if not rows:
                 # Try partial match as last resort
                 first_name = html_name.split('_')[0]
-                mask = profiles_df['Name'].str.contains(first_name, case=False, na=False)
-                if not mask.any():
+                rows = profiles_df.index[profiles_df['Name'].str.contains(first_name, case=False, na=False)].tolist()
+                if not rows:
                     continue
+        rows = list(rows)
         
-        # Extract stats from HTML
-        stats = extract_fighter_stats_from_html(str(html_file))
+        # Skip files that yielded no stats
         if not stats:
             continue
         
+        # Keep the name index in step when the page renames the matched rows
+        if 'Name' in stats:
+            for idx in rows:
+                old_name = profiles_df.at[idx, 'Name']
+                if isinstance(old_name, str):
+                    rows_by_name[old_name.lower()].remove(idx)
+                rows_by_name[stats['Name'].lower()].append(idx)
+        
         # Update the fighter profile
         for col, value in stats.items():
             if col in profiles_df.columns:
-                profiles_df.loc[mask, col] = value
+                profiles_df.loc[rows, col] = value
         
         updated_count += 1
         if updated_count % 100 == 0:
@@ -5,8 +5,12 @@ Processes ESPN MMA data with UPSERT logic and real web scraping
 """
 
 import pandas as pd
+import json
 import logging
+import mmap
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import shutil
@@ -16,9 +20,229 @@ from bs4 import BeautifulSoup
 # Import the new ESPN scraper
 from src.espn_scraper import ESPNFighterScraper, create_sample_fighter_data
 
+# Shared decoder for the embedded ESPN JSON
+JSON_DECODER = json.JSONDecoder()
+
+# Version of the HTML profile extraction stored with each cached profile; bump it whenever
+# _extract_profile_from_html_file or the patterns below change so cached profiles are reparsed
+PROFILE_PARSER_VERSION = 1
+
+# Profile text patterns, compiled once at import instead of on every fighter.
+# Numbers are anchored with (?<!\d) so a long digit run is only tried from its first digit.
+RECORD_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'Record:\s*(\d+)-(\d+)-(\d+)',  # "Record: X-Y-Z"
+    r'(?<!\d)(\d+)-(\d+)-(\d+)\s*\(W-L-D\)',  # "X-Y-Z (W-L-D)"
+    r'(?<!\d)(\d+)-(\d+)-(\d+)\s*record',  # "X-Y-Z record"
+    r'(?<!\d)(\d+)\s*wins.*?(?<!\d)(\d+)\s*losses.*?(?<!\d)(\d+)\s*draws',  # "X wins, Y losses, Z draws"
+    r'(?<!\d)(\d+)\s*wins.*?(?<!\d)(\d+)\s*losses',  # "X wins, Y losses"
+)]
+
+DIVISION_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(\w+weight)\s*Division',
+    r'Division:\s*(\w+weight)',
+    r'(\w+weight)\s*class',
+)]
+
+# All stats fields in one alternation so the page text is scanned once; group name -> profile field
+STATS_FIELDS = {
+    'ko': 'Wins by Knockout',
+    'sub': 'Wins by Submission',
+    'dec': 'Wins by Decision',
+    'age': 'Age',
+    'height': 'Height',
+    'weight': 'Weight',
+    'reach': 'Reach',
+}
+STATS_PATTERN = re.compile(
+    r'(?<!\d)(?P<ko>\d+)\s*(?:KO|knockout)'
+    r'|(?<!\d)(?P<sub>\d+)\s*(?:submission|SUB)'
+    r'|(?<!\d)(?P<dec>\d+)\s*(?:decision|DEC)'
+    r'|Age:\s*(?P<age>\d+)'
+    r'|Height:\s*(?P<height>\d+)'
+    r'|Weight:\s*(?P<weight>\d+)'
+    r'|Reach:\s*(?P<reach>\d+)',
+    re.IGNORECASE
+)
+
+def _extract_profile_from_html_file(html_file):
+    """Extract one fighter profile from a stored ESPN HTML file (None when it has no usable data)"""
+    try:
+        # Extract fighter name from filename
+        fighter_name = html_file.stem.replace('_', ' ')
+        
+        # Skip small placeholder files
+        if html_file.stat().st_size < 10000:
+            return None
+        
+        # Map the file and search the raw bytes; only the JSON tail gets decoded to str
+        with open(html_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            anchor = mm.find(b'"prtlCmnApiRsp"')
+            brace = mm.find(b'{', anchor) if anchor >= 0 else -1
+            json_content = mm[brace:].decode('utf-8') if brace >= 0 else ''
+        
+        # Look for the ESPN embedded JSON object
+        if not json_content:
+            logging.debug(f"No ESPN JSON found in {fighter_name}")
+            return None
+        # Decode straight from the opening brace; raw_decode finds the matching end in C
+        try:
+            data, _ = JSON_DECODER.raw_decode(json_content)
+        except ValueError as e:
+            logging.debug(f"JSON parse error for {fighter_name}: {e}")
+            return None
+        # Navigate to athlete data (ESPN structure uses plyrHdr)
+        if 'plyrHdr' not in data:
+            logging.debug(f"No plyrHdr found in {fighter_name}")
+            return None
+        athlete_data = data['plyrHdr']
+        logging.info(f"Successfully extracted data for {fighter_name}")
+
+        # Extract profile information with proper column format
+        profile = {
+            'Name': fighter_name,
+            'Division Tr': athlete_data.get('ath', {}).get('wghtclss', '') if 'ath' in athlete_data else '',
+            'Division Rk': '',
+            'Wins by Kn': 0,
+            'Wins by Su': 0,
+            'First Roun': 0,
+            'Wins by De': 0,
+            'Striking ac': '',
+            'Sig. Strike': 0,
+            'Takedownr': 0,
+            'Sig. Str. La': 0,
+            'Sig. Str. At': 0,
+            'Submissio': 0,
+            'Sig. Str. De': '',
+            'Knockdow': 0,
+            'Average Sig': '',
+            'Event_1_H': '',
+            'Event_1_D': '',
+            'Event_1_R': '',
+            'Event_1_Ti': '',
+            'Event_1_M': '',
+            'Event_2_H': '',
+            'Event_2_D': '',
+            'Event_2_R': '',
+            'Event_2_Ti': '',
+            'Event_2_M': '',
+            'Event_3_H': '',
+            'Event_3_D': '',
+            'Event_3_R': '',
+            'Event_3_Ti': '',
+            'Event_3_M': '',
+            'Status': 'Active',
+            'Place_ct': '',
+            'Fighting_s': '',
+            'Age': '',
+            'Height': '',
+            'Weight': '',
+            'Octagon_Reach': '',
+            'Leg_reach': '',
+            'Reach': '',
+            'Trains_at': '',
+            'Fight': '',
+            'Win': '',
+            'Title': '',
+            'Defeat': '',
+            'Former Champion': ''
+        }
+        
+        # Extract record from statsBlck.vals (correct ESPN structure)
+        if 'statsBlck' in athlete_data and 'vals' in athlete_data['statsBlck']:
+            # Index the stat entries by name once instead of comparing every entry per field
+            stats = {stat.get('name'): stat for stat in athlete_data['statsBlck']['vals']}
+            
+            if 'Wins-Losses-Draws' in stats:
+                record = stats['Wins-Losses-Draws'].get('val', '0-0-0')
+                profile['Division Rk'] = record
+                
+                # Parse W-L-D (only the wins are used)
+                parts = record.split('-', 2)
+                if len(parts) >= 3:
+                    profile['Wins by De'] = int(parts[0]) if parts[0].isdigit() else 0
+            if 'Technical Knockout-Technical Knockout Losses' in stats:
+                parts = stats['Technical Knockout-Technical Knockout Losses'].get('val', '0-0').split('-', 1)
+                if len(parts) >= 2:
+                    profile['Wins by Kn'] = int(parts[0]) if parts[0].isdigit() else 0
+            if 'Submissions-Submission Losses' in stats:
+                parts = stats['Submissions-Submission Losses'].get('val', '0-0').split('-', 1)
+                if len(parts) >= 2:
+                    profile['Wins by Su'] = int(parts[0]) if parts[0].isdigit() else 0
+        
+        # Extract personal info from ath (correct ESPN structure)
+        if 'ath' in athlete_data:
+            ath_data = athlete_data['ath']
+            if 'htwt' in ath_data:
+                profile['Height'] = ath_data['htwt']
+                profile['Weight'] = ath_data['htwt']
+            if 'dob' in ath_data:
+                # Extract age from dob like "12/20/1990 (34)"
+                dob_str = ath_data['dob']
+                if '(' in dob_str and ')' in dob_str:
+                    age_str = dob_str.split('(')[1].split(')')[0]
+                    profile['Age'] = float(age_str) if age_str.isdigit() else ''
+            if 'rch' in ath_data:
+                profile['Reach'] = ath_data['rch']
+            if 'stnc' in ath_data:
+                profile['Fighting_s'] = ath_data['stnc']
+            if 'cntry' in ath_data:
+                profile['Place_ct'] = ath_data['cntry']
+            if 'tm' in ath_data:
+                profile['Trains_at'] = ath_data['tm']
+        
+
+        
+        # Extract personal info from plyrHdr.ath (correct ESPN structure)
+        if 'plyrHdr' in athlete_data and 'ath' in athlete_data['plyrHdr']:
+            ath_data = athlete_data['plyrHdr']['ath']
+            if 'htwt' in ath_data:
+                profile['Height'] = ath_data['htwt']
+            if 'htwt' in ath_data:
+                profile['Weight'] = ath_data['htwt']
+            if 'dob' in ath_data:
+                # Extract age from dob like "12/20/1990 (34)"
+                dob_str = ath_data['dob']
+                if '(' in dob_str and ')' in dob_str:
+                    age_str = dob_str.split('(')[1].split(')')[0]
+                    profile['Age'] = float(age_str) if age_str.isdigit() else ''
+            if 'rch' in ath_data:
+                profile['Reach'] = ath_data['rch']
+            if 'stnc' in ath_data:
+                profile['Fighting_s'] = ath_data['stnc']
+            if 'cntry' in ath_data:
+                profile['Place_ct'] = ath_data['cntry']
+            if 'tm' in ath_data:
+                profile['Trains_at'] = ath_data['tm']
+            if 'wghtclss' in ath_data:
+                profile['Division Tr'] = ath_data['wghtclss']
+        
+        return profile
+    except Exception as e:
+        logging.warning(f"Error processing {html_file.name}: {e}")
+        return None
+
 class ESPNDataProcessor:
     """Processes ESPN MMA data with UPSERT logic and real scraping"""
     
+    # Leading columns shared by the clinch, ground and striking living documents
+    RECORD_KEY_COLUMNS = ['Player', 'Date', 'Opponent', 'Event', 'Result']
+    
+    # Living-document column -> key in the scraped fighter data
+    CLINCH_FIELDS = {
+        'SCBL': 'SCBL', 'SCBA': 'SCBA', 'SCHL': 'SCHL', 'SCHA': 'SCHA', 'SCLL': 'SCLL', 'SCLA': 'SCLA',
+        'RV': 'RV', 'SR': 'SR', 'TDL': 'TDL', 'TDA': 'TDA', 'TDS': 'TDS', 'TK ACC': 'TK_ACC',
+    }
+    GROUND_FIELDS = {
+        'SGBL': 'SGBL', 'SGBA': 'SGBA', 'SGHL': 'SGHL', 'SGHA': 'SGHA', 'SGLL': 'SGLL', 'SGLA': 'SGLA',
+        'AD': 'AD', 'ADHG': 'ADHG', 'ADTB': 'ADTB', 'ADTM': 'ADTM', 'ADTS': 'ADTS', 'SM': 'SM',
+    }
+    STRIKING_FIELDS = {
+        'SDBL/A': 'SDBL_A', 'SDHL/A': 'SDHL_A', 'SDLL/A': 'SDLL_A', 'TSL': 'TSL', 'TSA': 'TSA',
+        'SSL': 'SSL', 'SSA': 'SSA', 'TSL-TSA': 'TSL_TSA', 'KD': 'KD',
+        '%BODY': 'BODY_PCT', '%HEAD': 'HEAD_PCT', '%LEG': 'LEG_PCT',
+    }
+    SCRAPED_PROFILE_COLUMNS = ['Fighter Name', 'ESPN URL', 'Scraped At', 'Total Fights', 'Last Updated']
+    
     def __init__(self, data_folder: str = "data"):
         self.data_folder = Path(data_folder)
         self.data_folder.mkdir(exist_ok=True)
@@ -127,10 +351,9 @@ class ESPNDataProcessor:
         if not self.fighter_html_folder.exists():
             return set()
         
-        html_files = set()
-        for file_path in self.fighter_html_folder.glob("*.html"):
-            html_files.add(file_path.stem)  # filename without extension
-        return html_files
+        # One directory scan into a set of stems (filename without extension), no Path per file
+        with os.scandir(self.fighter_html_folder) as entries:
+            return {entry.name[:-5] for entry in entries if entry.name.endswith('.html')}
     
     def upsert_html_files(self, new_html_files):
         """
@@ -148,6 +371,9 @@ class ESPNDataProcessor:
         existing_files = self.get_existing_html_files()
         self.logger.info(f"Found {len(existing_files)} existing HTML files")
         
+        new_count = 0
+        updated_count = 0
+        
         # Process new HTML files
         for fighter_name, html_content in new_html_files.items():
             # Clean fighter name for filename
@@ -155,9 +381,12 @@ class ESPNDataProcessor:
             html_file = self.fighter_html_folder / f"{safe_name}.html"
             
             # Only write if file doesn't exist or content is different
+            # (membership in the listing taken above avoids a stat call per fighter)
             should_write = False
-            if not html_file.exists():
+            if safe_name not in existing_files:
                 should_write = True
+                new_count += 1
+                existing_files.add(safe_name)
                 self.logger.info(f"New HTML file: {safe_name}")
             else:
                 # Check if content is different
@@ -166,6 +395,7 @@ class ESPNDataProcessor:
                         existing_content = f.read()
                     if existing_content != html_content:
                         should_write = True
+                        updated_count += 1
                         self.logger.info(f"Updated HTML file: {safe_name}")
                 except Exception as e:
                     self.logger.warning(f"Error reading existing HTML for {safe_name}: {e}")
@@ -179,7 +409,8 @@ class ESPNDataProcessor:
                 except Exception as e:
                     self.logger.error(f"Error saving HTML for {fighter_name}: {e}")
         
-        self.logger.info(f"HTML UPSERT completed. Total files: {len(self.get_existing_html_files())}")
+        self.logger.info(f"HTML UPSERT completed. Total files: {len(existing_files)}")
+        return new_count, updated_count
     
     def scrape_fighter_data(self, fighter_names: List[str]) -> Dict[str, pd.DataFrame]:
         """
@@ -194,12 +425,15 @@ class ESPNDataProcessor:
             progress_callback=self._progress_callback
         )
         
-        # Convert scraped data to DataFrames
+        # Convert scraped data to row tuples; columns are laid out once by the class constants
         clinch_records = []
         ground_records = []
         striking_records = []
         profile_records = []
         
+        # One timestamp for the whole batch instead of formatting a datetime per fighter
+        last_updated = datetime.now().isoformat()
+        
         for fighter_data in scraped_data:
             if not fighter_data or 'error' in fighter_data:
                 self.logger.warning(f"Skipping fighter with error: {fighter_data.get('fighter_name', 'Unknown')}")
@@ -209,87 +443,24 @@ class ESPNDataProcessor:
             espn_url = fighter_data.get('espn_url', '')
             scraped_at = fighter_data.get('scraped_at', '')
             
-            # Create clinch record
-            clinch_record = {
-                'Player': fighter_name,
-                'Date': scraped_at,
-                'Opponent': 'N/A',  # Will be filled from fight history
-                'Event': 'ESPN Scraped',
-                'Result': 'N/A',
-                'SCBL': fighter_data.get('SCBL', '-'),
-                'SCBA': fighter_data.get('SCBA', '-'),
-                'SCHL': fighter_data.get('SCHL', '-'),
-                'SCHA': fighter_data.get('SCHA', '-'),
-                'SCLL': fighter_data.get('SCLL', '-'),
-                'SCLA': fighter_data.get('SCLA', '-'),
-                'RV': fighter_data.get('RV', '-'),
-                'SR': fighter_data.get('SR', '-'),
-                'TDL': fighter_data.get('TDL', '-'),
-                'TDA': fighter_data.get('TDA', '-'),
-                'TDS': fighter_data.get('TDS', '-'),
-                'TK ACC': fighter_data.get('TK_ACC', '-')
-            }
-            clinch_records.append(clinch_record)
-            
-            # Create ground record
-            ground_record = {
-                'Player': fighter_name,
-                'Date': scraped_at,
-                'Opponent': 'N/A',
-                'Event': 'ESPN Scraped',
-                'Result': 'N/A',
-                'SGBL': fighter_data.get('SGBL', '-'),
-                'SGBA': fighter_data.get('SGBA', '-'),
-                'SGHL': fighter_data.get('SGHL', '-'),
-                'SGHA': fighter_data.get('SGHA', '-'),
-                'SGLL': fighter_data.get('SGLL', '-'),
-                'SGLA': fighter_data.get('SGLA', '-'),
-                'AD': fighter_data.get('AD', '-'),
-                'ADHG': fighter_data.get('ADHG', '-'),
-                'ADTB': fighter_data.get('ADTB', '-'),
-                'ADTM': fighter_data.get('ADTM', '-'),
-                'ADTS': fighter_data.get('ADTS', '-'),
-                'SM': fighter_data.get('SM', '-')
-            }
-            ground_records.append(ground_record)
-            
-            # Create striking record
-            striking_record = {
-                'Player': fighter_name,
-                'Date': scraped_at,
-                'Opponent': 'N/A',
-                'Event': 'ESPN Scraped',
-                'Result': 'N/A',
-                'SDBL/A': fighter_data.get('SDBL_A', '-'),
-                'SDHL/A': fighter_data.get('SDHL_A', '-'),
-                'SDLL/A': fighter_data.get('SDLL_A', '-'),
-                'TSL': fighter_data.get('TSL', '-'),
-                'TSA': fighter_data.get('TSA', '-'),
-                'SSL': fighter_data.get('SSL', '-'),
-                'SSA': fighter_data.get('SSA', '-'),
-                'TSL-TSA': fighter_data.get('TSL_TSA', '-'),
-                'KD': fighter_data.get('KD', '-'),
-                '%BODY': fighter_data.get('BODY_PCT', '-'),
-                '%HEAD': fighter_data.get('HEAD_PCT', '-'),
-                '%LEG': fighter_data.get('LEG_PCT', '-')
-            }
-            striking_records.append(striking_record)
-            
-            # Create profile record
-            profile_record = {
-                'Fighter Name': fighter_name,
-                'ESPN URL': espn_url,
-                'Scraped At': scraped_at,
-                'Total Fights': len(fighter_data.get('fight_history', [])),
-                'Last Updated': datetime.now().isoformat()
-            }
-            profile_records.append(profile_record)
-        
-        # Convert to DataFrames
-        new_clinch_df = pd.DataFrame(clinch_records)
-        new_ground_df = pd.DataFrame(ground_records)
-        new_striking_df = pd.DataFrame(striking_records)
-        new_profiles_df = pd.DataFrame(profile_records)
+            # Opponent/Result will be filled from fight history
+            key_values = (fighter_name, scraped_at, 'N/A', 'ESPN Scraped', 'N/A')
+            clinch_records.append(key_values + tuple(fighter_data.get(key, '-') for key in self.CLINCH_FIELDS.values()))
+            ground_records.append(key_values + tuple(fighter_data.get(key, '-') for key in self.GROUND_FIELDS.values()))
+            striking_records.append(key_values + tuple(fighter_data.get(key, '-') for key in self.STRIKING_FIELDS.values()))
+            profile_records.append((
+                fighter_name,
+                espn_url,
+                scraped_at,
+                len(fighter_data.get('fight_history', [])),
+                last_updated
+            ))
+        
+        # Convert to DataFrames in one pass each
+        new_clinch_df = pd.DataFrame.from_records(clinch_records, columns=self.RECORD_KEY_COLUMNS + list(self.CLINCH_FIELDS))
+        new_ground_df = pd.DataFrame.from_records(ground_records, columns=self.RECORD_KEY_COLUMNS + list(self.GROUND_FIELDS))
+        new_striking_df = pd.DataFrame.from_records(striking_records, columns=self.RECORD_KEY_COLUMNS + list(self.STRIKING_FIELDS))
+        new_profiles_df = pd.DataFrame.from_records(profile_records, columns=self.SCRAPED_PROFILE_COLUMNS)
         
         self.logger.info(f"Scraped {len(new_clinch_df)} clinch records")
         self.logger.info(f"Scraped {len(new_ground_df)} ground records")
@@ -363,10 +534,14 @@ class ESPNDataProcessor:
             try:
                 logging.info(f"Scraping {fighter_name} ({i}/{len(fighter_names)})")
                 
-                # Use the improved scraper to get fighter stats (which saves HTML)
-                fighter_data = scraper.get_fighter_stats(fighter_name)
+                # Use the improved scraper to save the HTML; the parsed stats are not needed here
+                fighter_data = scraper.get_fighter_stats(fighter_name, parse_stats=False)
                 
-                if fighter_data and 'html_file' in fighter_data:
+                if fighter_data and 'html' in fighter_data:
+                    # The scraper returns the page text it saved, so no re-read is needed
+                    scraped_htmls[fighter_name] = fighter_data['html']
+                    logging.info(f"Successfully scraped HTML for {fighter_name}")
+                elif fighter_data and 'html_file' in fighter_data:
                     # Read the saved HTML file
                     html_file_path = Path(fighter_data['html_file'])
                     if html_file_path.exists():
@@ -442,174 +617,44 @@ class ESPNDataProcessor:
     
     def _extract_profiles_from_html(self):
         """Extract fighter profile data from stored HTML files"""
-        import json
-        import re
-        
-        profiles = []
-        
         # Get all HTML files
         html_files = list(self.fighter_html_folder.glob("*.html"))
         logging.info(f"Found {len(html_files)} HTML files to process")
         
-        for html_file in html_files:
+        # Reuse profiles parsed on earlier runs for HTML files that have not changed since
+        cache_file = self.data_folder / "html_profile_cache.json"
+        cache = {}
+        if cache_file.exists():
             try:
-                # Extract fighter name from filename
-                fighter_name = html_file.stem.replace('_', ' ')
-                
-                # Read HTML content
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                
-                # Skip small placeholder files
-                if len(html_content) < 10000:
-                    continue
-                
-                # Look for the ESPN embedded JSON object
-                match = re.search(r'"prtlCmnApiRsp"\s*:\s*({.*?})\s*,\s*"pageType"', html_content, re.DOTALL)
-                if not match:
-                    logging.debug(f"No ESPN JSON found in {fighter_name}")
-                    continue
-                json_str = match.group(1)
-                try:
-                    data = json.loads(json_str)
-                except Exception as e:
-                    logging.debug(f"JSON parse error for {fighter_name}: {e}")
-                    continue
-                # Navigate to athlete data (ESPN structure uses plyrHdr)
-                if 'plyrHdr' not in data:
-                    logging.debug(f"No plyrHdr found in {fighter_name}")
-                    continue
-                athlete_data = data['plyrHdr']
-                logging.info(f"Successfully extracted data for {fighter_name}")
-
-                # Extract profile information with proper column format
-                profile = {
-                    'Name': fighter_name,
-                    'Division Tr': athlete_data.get('ath', {}).get('wghtclss', '') if 'ath' in athlete_data else '',
-                    'Division Rk': '',
-                    'Wins by Kn': 0,
-                    'Wins by Su': 0,
-                    'First Roun': 0,
-                    'Wins by De': 0,
-                    'Striking ac': '',
-                    'Sig. Strike': 0,
-                    'Takedownr': 0,
-                    'Sig. Str. La': 0,
-                    'Sig. Str. At': 0,
-                    'Submissio': 0,
-                    'Sig. Str. De': '',
-                    'Knockdow': 0,
-                    'Average Sig': '',
-                    'Event_1_H': '',
-                    'Event_1_D': '',
-                    'Event_1_R': '',
-                    'Event_1_Ti': '',
-                    'Event_1_M': '',
-                    'Event_2_H': '',
-                    'Event_2_D': '',
-                    'Event_2_R': '',
-                    'Event_2_Ti': '',
-                    'Event_2_M': '',
-                    'Event_3_H': '',
-                    'Event_3_D': '',
-                    'Event_3_R': '',
-                    'Event_3_Ti': '',
-                    'Event_3_M': '',
-                    'Status': 'Active',
-                    'Place_ct': '',
-                    'Fighting_s': '',
-                    'Age': '',
-                    'Height': '',
-                    'Weight': '',
-                    'Octagon_Reach': '',
-                    'Leg_reach': '',
-                    'Reach': '',
-                    'Trains_at': '',
-                    'Fight': '',
-                    'Win': '',
-                    'Title': '',
-                    'Defeat': '',
-                    'Former Champion': ''
-                }
-                
-                # Extract record from statsBlck.vals (correct ESPN structure)
-                if 'statsBlck' in athlete_data and 'vals' in athlete_data['statsBlck']:
-                    stats = athlete_data['statsBlck']['vals']
-                    for stat in stats:
-                        if stat.get('name') == 'Wins-Losses-Draws':
-                            record = stat.get('val', '0-0-0')
-                            profile['Division Rk'] = record
-                            
-                            # Parse W-L-D
-                            parts = record.split('-')
-                            if len(parts) >= 3:
-                                wins = int(parts[0]) if parts[0].isdigit() else 0
-                                losses = int(parts[1]) if parts[1].isdigit() else 0
-                                draws = int(parts[2]) if parts[2].isdigit() else 0
-                                profile['Wins by De'] = wins
-                        elif stat.get('name') == 'Technical Knockout-Technical Knockout Losses':
-                            tko_record = stat.get('val', '0-0')
-                            parts = tko_record.split('-')
-                            if len(parts) >= 2:
-                                profile['Wins by Kn'] = int(parts[0]) if parts[0].isdigit() else 0
-                        elif stat.get('name') == 'Submissions-Submission Losses':
-                            sub_record = stat.get('val', '0-0')
-                            parts = sub_record.split('-')
-                            if len(parts) >= 2:
-                                profile['Wins by Su'] = int(parts[0]) if parts[0].isdigit() else 0
-                
-                # Extract personal info from ath (correct ESPN structure)
-                if 'ath' in athlete_data:
-                    ath_data = athlete_data['ath']
-                    if 'htwt' in ath_data:
-                        profile['Height'] = ath_data['htwt']
-                        profile['Weight'] = ath_data['htwt']
-                    if 'dob' in ath_data:
-                        # Extract age from dob like "12/20/1990 (34)"
-                        dob_str = ath_data['dob']
-                        if '(' in dob_str and ')' in dob_str:
-                            age_str = dob_str.split('(')[1].split(')')[0]
-                            profile['Age'] = float(age_str) if age_str.isdigit() else ''
-                    if 'rch' in ath_data:
-                        profile['Reach'] = ath_data['rch']
-                    if 'stnc' in ath_data:
-                        profile['Fighting_s'] = ath_data['stnc']
-                    if 'cntry' in ath_data:
-                        profile['Place_ct'] = ath_data['cntry']
-                    if 'tm' in ath_data:
-                        profile['Trains_at'] = ath_data['tm']
-                
-
-                
-                # Extract personal info from plyrHdr.ath (correct ESPN structure)
-                if 'plyrHdr' in athlete_data and 'ath' in athlete_data['plyrHdr']:
-                    ath_data = athlete_data['plyrHdr']['ath']
-                    if 'htwt' in ath_data:
-                        profile['Height'] = ath_data['htwt']
-                    if 'htwt' in ath_data:
-                        profile['Weight'] = ath_data['htwt']
-                    if 'dob' in ath_data:
-                        # Extract age from dob like "12/20/1990 (34)"
-                        dob_str = ath_data['dob']
-                        if '(' in dob_str and ')' in dob_str:
-                            age_str = dob_str.split('(')[1].split(')')[0]
-                            profile['Age'] = float(age_str) if age_str.isdigit() else ''
-                    if 'rch' in ath_data:
-                        profile['Reach'] = ath_data['rch']
-                    if 'stnc' in ath_data:
-                        profile['Fighting_s'] = ath_data['stnc']
-                    if 'cntry' in ath_data:
-                        profile['Place_ct'] = ath_data['cntry']
-                    if 'tm' in ath_data:
-                        profile['Trains_at'] = ath_data['tm']
-                    if 'wghtclss' in ath_data:
-                        profile['Division Tr'] = ath_data['wghtclss']
-                
-                profiles.append(profile)
-                
-            except Exception as e:
-                self.logger.warning(f"Error processing {html_file.name}: {e}")
-                continue
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable profile cache {cache_file}: {e}")
+        
+        # Key on exact mtime and size so a rewrite within the float mtime resolution still reparses
+        file_stats = {}
+        for html_file in html_files:
+            st = html_file.stat()
+            file_stats[html_file.name] = [st.st_mtime_ns, st.st_size]
+        def is_current(entry, html_file):
+            return (entry.get('version') == PROFILE_PARSER_VERSION
+                    and entry.get('stat') == file_stats[html_file.name])
+        stale_files = [html_file for html_file in html_files
+                       if not is_current(cache.get(html_file.name, {}), html_file)]
+        logging.info(f"Parsing {len(stale_files)} new or changed HTML files ({len(html_files) - len(stale_files)} cached)")
+        
+        # Each file is parsed independently, so spread them over worker processes
+        if stale_files:
+            with ProcessPoolExecutor() as executor:
+                for html_file, profile in zip(stale_files, executor.map(_extract_profile_from_html_file, stale_files, chunksize=16)):
+                    cache[html_file.name] = {'version': PROFILE_PARSER_VERSION, 'stat': file_stats[html_file.name], 'profile': profile}
+        
+        # Drop entries for removed files and keep the on-disk cache in step
+        cache = {name: cache[name] for name in file_stats}
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        
+        profiles = [cache[html_file.name]['profile'] for html_file in html_files if cache[html_file.name]['profile']]
         
         result_df = pd.DataFrame(profiles)
         logging.info(f"Extracted {len(profiles)} profiles from HTML files")
@@ -684,21 +729,11 @@ class ESPNDataProcessor:
                 'Former Champion': ''
             }
             
-            # Look for record information
-            record_patterns = [
-                r'Record:\s*(\d+)-(\d+)-(\d+)',  # "Record: X-Y-Z"
-                r'(\d+)-(\d+)-(\d+)\s*\(W-L-D\)',  # "X-Y-Z (W-L-D)"
-                r'(\d+)-(\d+)-(\d+)\s*record',  # "X-Y-Z record"
-                r'(\d+)\s*wins.*?(\d+)\s*losses.*?(\d+)\s*draws',  # "X wins, Y losses, Z draws"
-                r'(\d+)\s*wins.*?(\d+)\s*losses',  # "X wins, Y losses"
-            ]
-            
             page_text = soup.get_text()
             
             # Try to find record
-            for pattern in record_patterns:
-                import re
-                match = re.search(pattern, page_text, re.IGNORECASE)
+            for pattern in RECORD_PATTERNS:
+                match = pattern.search(page_text)
                 if match:
                     if len(match.groups()) == 3:
                         wins, losses, draws = match.groups()
@@ -714,37 +749,22 @@ class ESPNDataProcessor:
                             break
             
             # Look for division information
-            division_patterns = [
-                r'(\w+weight)\s*Division',
-                r'Division:\s*(\w+weight)',
-                r'(\w+weight)\s*class'
-            ]
-            
-            for pattern in division_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
+            for pattern in DIVISION_PATTERNS:
+                match = pattern.search(page_text)
                 if match:
                     profile['Division Title'] = f"{match.group(1).title()} Division"
                     break
             
-            # Look for fight statistics
-            stats_patterns = {
-                'Wins by Knockout': r'(\d+)\s*KO|(\d+)\s*knockout',
-                'Wins by Submission': r'(\d+)\s*submission|(\d+)\s*SUB',
-                'Wins by Decision': r'(\d+)\s*decision|(\d+)\s*DEC',
-                'Age': r'Age:\s*(\d+)',
-                'Height': r'Height:\s*(\d+)',
-                'Weight': r'Weight:\s*(\d+)',
-                'Reach': r'Reach:\s*(\d+)',
-            }
-            
-            for field, pattern in stats_patterns.items():
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    try:
-                        value = int(match.group(1) or match.group(2))
-                        profile[field] = value
-                    except (ValueError, IndexError):
-                        continue
+            # Look for fight statistics, keeping the first match of each field
+            found = set()
+            match = STATS_PATTERN.search(page_text)
+            while match and len(found) < len(STATS_FIELDS):
+                group = match.lastgroup
+                if group not in found:
+                    found.add(group)
+                    profile[STATS_FIELDS[group]] = int(match.group(group))
+                # Resume one character on so overlapping matches (e.g. "Age: 34 KO") are still seen
+                match = STATS_PATTERN.search(page_text, match.start() + 1)
             
             # Look for recent fight history
             fight_history = self._extract_recent_fights(soup)
@@ -762,8 +782,8 @@ class ESPNDataProcessor:
             logging.error(f"Error parsing profile for {fighter_name}: {e}")
             return None
     
-    def _extract_recent_fights(self, soup: BeautifulSoup) -> list:
-        """Extract recent fight history from HTML"""
+    def _extract_recent_fights(self, soup: BeautifulSoup, limit: int = 3) -> list:
+        """Extract recent fight history from HTML (only the first `limit` fights are built)"""
         fights = []
         try:
             # Look for fight history tables or sections
@@ -782,8 +802,11 @@ class ESPNDataProcessor:
                             'method': cells[4].get_text().strip() if len(cells) > 4 else ''
                         }
                         fights.append(fight)
+                        # Stop once we have the most recent fights instead of building the whole career
+                        if len(fights) >= limit:
+                            return fights
             
-            return fights[:3]  # Return only 3 most recent fights
+            return fights
             
         except Exception as e:
             logging.error(f"Error extracting fight history: {e}")
@@ -37,10 +37,11 @@ class ESPNFighterScraper:
         # Request tracking for anti-detection
         self.success_count = 0
         self.failure_count = 0
-        self.last_request_time = 0
+        # Request timing uses the monotonic clock (no datetime objects, immune to clock changes)
+        self.last_request_time = float('-inf')
         self.request_count = 0
         self.requests_this_minute = 0
-        self.minute_start = datetime.now()
+        self.minute_start = time.monotonic()
         
         self.logger = logging.getLogger(__name__)
 
@@ -76,57 +77,56 @@ class ESPNFighterScraper:
         self.session.headers['User-Agent'] = random.choice(self.USER_AGENTS)
 
     def _rate_limit_wait(self):
-        current_time = datetime.now()
+        current_time = time.monotonic()
         
         # Reset minute counter if a minute has passed
-        if (current_time - self.minute_start).total_seconds() >= 60:
+        if current_time - self.minute_start >= 60:
             self.requests_this_minute = 0
             self.minute_start = current_time
         
         # Enforce max 25 requests per minute (ESPN's limit)
         if self.requests_this_minute >= 25:
-            sleep_time = 60 - (current_time - self.minute_start).total_seconds()
+            sleep_time = 60 - (current_time - self.minute_start)
             if sleep_time > 0:
                 self.logger.info(f"Rate limit reached, sleeping for {sleep_time:.1f} seconds")
                 time.sleep(sleep_time)
-                self.minute_start = datetime.now()
+                current_time = self.minute_start = time.monotonic()
                 self.requests_this_minute = 0
         
         # Basic delay between requests
-        current_time = time.time()
         time_since_last = current_time - self.last_request_time
         if time_since_last < self.rate_limit:
-            sleep_time = self.rate_limit - time_since_last
-            time.sleep(sleep_time)
+            time.sleep(self.rate_limit - time_since_last)
+            current_time = time.monotonic()
         
-        self.last_request_time = time.time()
+        self.last_request_time = current_time
         self.requests_this_minute += 1
 
     def _make_request(self, url: str, retries: int = 0) -> requests.Response:
-        try:
-            self._rate_limit_wait()
-            self._rotate_user_agent()
-            
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 403 and retries < self.max_retries:
+        # Retry in a loop rather than recursing, so each attempt doesn't add a stack frame
+        while True:
+            try:
+                self._rate_limit_wait()
+                self._rotate_user_agent()
+                
+                response = self.session.get(url, timeout=10)
+                response.raise_for_status()
+                return response
+                
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code != 403 or retries >= self.max_retries:
+                    raise
                 wait_time = (2 ** retries) + random.uniform(0, 1)
                 self.logger.warning(f"403 error, waiting {wait_time:.2f} seconds before retry {retries + 1}")
-                time.sleep(wait_time)
-                return self._make_request(url, retries + 1)
-            raise
-        except requests.exceptions.RequestException as e:
-            if retries < self.max_retries:
+            except requests.exceptions.RequestException as e:
+                if retries >= self.max_retries:
+                    self.logger.error(f"Request failed for {url} after {self.max_retries} retries: {e}")
+                    raise
                 wait_time = (2 ** retries) + random.uniform(0, 1)
                 self.logger.warning(f"Request failed, waiting {wait_time:.2f} seconds before retry {retries + 1}")
-                time.sleep(wait_time)
-                return self._make_request(url, retries + 1)
-            else:
-                self.logger.error(f"Request failed for {url} after {self.max_retries} retries: {e}")
-                raise
+            
+            time.sleep(wait_time)
+            retries += 1
     
     def search_fighter_url(self, fighter_name: str) -> Optional[str]:
         """Search for fighter URL using ESPN's search API"""
@@ -167,10 +167,10 @@ class ESPNFighterScraper:
             self.logger.error(f"Error searching for {fighter_name}: {str(e)}")
             return None
     
-    def get_fighter_stats(self, fighter_name: str) -> Optional[Dict]:
+    def get_fighter_stats(self, fighter_name: str, parse_stats: bool = True) -> Optional[Dict]:
         """
         Get fighter statistics from ESPN and save HTML file
-        Returns a dictionary with fighter stats
+        Returns a dictionary with fighter stats (empty, plus the page 'html', when parse_stats is False)
         """
         try:
             # Search for fighter URL
@@ -191,10 +191,14 @@ class ESPNFighterScraper:
             
             self.logger.info(f"Saved HTML for {fighter_name} to {file_path}")
             
-            # Extract basic stats (placeholder for now)
-            soup = BeautifulSoup(profile_response.content, 'html.parser')
-            fight_stats = self._extract_fight_stats(soup)
-            fight_history = self._extract_fight_history(soup)
+            # Extract basic stats (placeholder for now); callers that only need the HTML skip the parse
+            fight_stats, fight_history = {}, []
+            if parse_stats:
+                soup = BeautifulSoup(profile_response.content, 'lxml')
+                # One tree walk collects both the stat tables and the fight-history sections
+                sections = soup.find_all(self._is_stats_or_history_section)
+                fight_stats = self._extract_fight_stats([tag for tag in sections if tag.name == 'table'])
+                fight_history = self._extract_fight_history([tag for tag in sections if tag.name == 'div'])
             
             fighter_data = {
                 'name': fighter_name,
@@ -204,6 +208,9 @@ class ESPNFighterScraper:
                 'fight_history': fight_history,
                 'html_file': str(file_path)
             }
+            if not parse_stats:
+                # Hand the page text back so HTML-only callers need not re-read the file just written
+                fighter_data['html'] = profile_response.text
             
             self.success_count += 1
             self.logger.info(f"Successfully scraped data for {fighter_name}")
@@ -214,25 +221,32 @@ class ESPNFighterScraper:
             self.logger.error(f"Error getting stats for {fighter_name}: {e}")
             return None
     
-    def _extract_fight_stats(self, soup: BeautifulSoup) -> Dict:
-        """Extract fight statistics from ESPN page"""
+    @staticmethod
+    def _is_stats_or_history_section(tag) -> bool:
+        """Match ESPN statistics tables (table.Table) and fight-history sections (div.fight-history)"""
+        classes = tag.get('class') or []
+        return ((tag.name == 'table' and 'Table' in classes)
+                or (tag.name == 'div' and 'fight-history' in classes))
+    
+    def _extract_fight_stats(self, stat_tables: List) -> Dict:
+        """Extract fight statistics from the ESPN page's statistics tables"""
         stats = {}
         
         try:
-            # Look for statistics tables
-            stat_tables = soup.find_all('table', class_='Table')
-            
             for table in stat_tables:
+                # Flatten the table text once for all three marker checks
+                table_text = table.get_text().lower()
+                
                 # Look for clinch statistics
-                if 'clinch' in table.get_text().lower():
+                if 'clinch' in table_text:
                     stats.update(self._parse_clinch_stats(table))
                 
                 # Look for ground statistics
-                elif 'ground' in table.get_text().lower():
+                elif 'ground' in table_text:
                     stats.update(self._parse_ground_stats(table))
                 
                 # Look for striking statistics
-                elif 'striking' in table.get_text().lower():
+                elif 'striking' in table_text:
                     stats.update(self._parse_striking_stats(table))
             
             return stats
@@ -245,104 +259,89 @@ class ESPNFighterScraper:
         """Parse clinch statistics from table"""
         stats = {}
         
-        try:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    stat_name = cells[0].get_text().strip()
-                    stat_value = cells[1].get_text().strip()
-                    
-                    # Map ESPN stats to our format
-                    if 'clinch' in stat_name.lower():
-                        if 'landed' in stat_name.lower():
-                            stats['SCBL'] = stat_value
-                        elif 'attempted' in stat_name.lower():
-                            stats['SCBA'] = stat_value
-                    elif 'takedown' in stat_name.lower():
-                        if 'landed' in stat_name.lower():
-                            stats['TDL'] = stat_value
-                        elif 'attempted' in stat_name.lower():
-                            stats['TDA'] = stat_value
-                        elif 'success' in stat_name.lower():
-                            stats['TDS'] = stat_value
-            
-            return stats
-            
-        except Exception as e:
-            self.logger.error(f"Error parsing clinch stats: {e}")
-            return {}
+        rows = table.find_all('tr')
+        for row in rows:
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                stat_name = cells[0].get_text().strip()
+                stat_value = cells[1].get_text().strip()
+                stat_key = stat_name.lower()  # lowercase once for all the label checks below
+                
+                # Map ESPN stats to our format
+                if 'clinch' in stat_key:
+                    if 'landed' in stat_key:
+                        stats['SCBL'] = stat_value
+                    elif 'attempted' in stat_key:
+                        stats['SCBA'] = stat_value
+                elif 'takedown' in stat_key:
+                    if 'landed' in stat_key:
+                        stats['TDL'] = stat_value
+                    elif 'attempted' in stat_key:
+                        stats['TDA'] = stat_value
+                    elif 'success' in stat_key:
+                        stats['TDS'] = stat_value
+        
+        return stats
     
     def _parse_ground_stats(self, table: BeautifulSoup) -> Dict:
         """Parse ground statistics from table"""
         stats = {}
         
-        try:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    stat_name = cells[0].get_text().strip()
-                    stat_value = cells[1].get_text().strip()
-                    
-                    # Map ESPN stats to our format
-                    if 'ground' in stat_name.lower():
-                        if 'landed' in stat_name.lower():
-                            stats['SGBL'] = stat_value
-                        elif 'attempted' in stat_name.lower():
-                            stats['SGBA'] = stat_value
-                    elif 'submission' in stat_name.lower():
-                        if 'attempted' in stat_name.lower():
-                            stats['SA'] = stat_value
-                        elif 'landed' in stat_name.lower():
-                            stats['SL'] = stat_value
-            
-            return stats
-            
-        except Exception as e:
-            self.logger.error(f"Error parsing ground stats: {e}")
-            return {}
+        rows = table.find_all('tr')
+        for row in rows:
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                stat_name = cells[0].get_text().strip()
+                stat_value = cells[1].get_text().strip()
+                stat_key = stat_name.lower()  # lowercase once for all the label checks below
+                
+                # Map ESPN stats to our format
+                if 'ground' in stat_key:
+                    if 'landed' in stat_key:
+                        stats['SGBL'] = stat_value
+                    elif 'attempted' in stat_key:
+                        stats['SGBA'] = stat_value
+                elif 'submission' in stat_key:
+                    if 'attempted' in stat_key:
+                        stats['SA'] = stat_value
+                    elif 'landed' in stat_key:
+                        stats['SL'] = stat_value
+        
+        return stats
     
     def _parse_striking_stats(self, table: BeautifulSoup) -> Dict:
         """Parse striking statistics from table"""
         stats = {}
         
-        try:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    stat_name = cells[0].get_text().strip()
-                    stat_value = cells[1].get_text().strip()
-                    
-                    # Map ESPN stats to our format
-                    if 'strikes' in stat_name.lower():
-                        if 'landed' in stat_name.lower():
-                            stats['SSL'] = stat_value
-                        elif 'attempted' in stat_name.lower():
-                            stats['SSA'] = stat_value
-                    elif 'total' in stat_name.lower() and 'strikes' in stat_name.lower():
-                        if 'landed' in stat_name.lower():
-                            stats['TSL'] = stat_value
-                        elif 'attempted' in stat_name.lower():
-                            stats['TSA'] = stat_value
-                    elif 'knockdown' in stat_name.lower():
-                        stats['KD'] = stat_value
-            
-            return stats
-            
-        except Exception as e:
-            self.logger.error(f"Error parsing striking stats: {e}")
-            return {}
+        rows = table.find_all('tr')
+        for row in rows:
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                stat_name = cells[0].get_text().strip()
+                stat_value = cells[1].get_text().strip()
+                stat_key = stat_name.lower()  # lowercase once for all the label checks below
+                
+                # Map ESPN stats to our format
+                if 'strikes' in stat_key:
+                    if 'landed' in stat_key:
+                        stats['SSL'] = stat_value
+                    elif 'attempted' in stat_key:
+                        stats['SSA'] = stat_value
+                elif 'total' in stat_key and 'strikes' in stat_key:
+                    if 'landed' in stat_key:
+                        stats['TSL'] = stat_value
+                    elif 'attempted' in stat_key:
+                        stats['TSA'] = stat_value
+                elif 'knockdown' in stat_key:
+                    stats['KD'] = stat_value
+        
+        return stats
     
-    def _extract_fight_history(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extract detailed fight history from ESPN page"""
+    def _extract_fight_history(self, fight_sections: List) -> List[Dict]:
+        """Extract detailed fight history from the ESPN page's fight-history sections"""
         fights = []
         
         try:
-            # Look for fight history section
-            fight_sections = soup.find_all('div', class_='fight-history')
-            
             for section in fight_sections:
                 fight_rows = section.find_all('tr')
                 